@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+"""Offline fixtures for the benchmarks."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pytelescope import datasets, orbiters
+
+
+@pytest.fixture(scope='session', autouse=True)
+def bundled_constants():
+    "Use the bundled body constants instead of SPICE."
+    use_spice = orbiters.use_spice
+    orbiters.use_spice = False
+    orbiters.clear_body_constants()
+    yield
+    orbiters.use_spice = use_spice
+    orbiters.clear_body_constants()
+
+
+@pytest.fixture(scope='session')
+def spectra_path(tmp_path_factory):
+    "Provide synthetic reflectance and QE tables for Radiometry."
+    path = tmp_path_factory.mktemp('spectra')
+    waves = np.arange(210, 1200, 2)
+    pd.DataFrame({'Wavelength[nm]': waves,
+                  'Reflectance': np.linspace(0.05, 0.3, waves.size)}
+                 ).to_csv(path / 'giza_crism_blue_halos.csv', index=False)
+    waves = np.arange(250, 1100, 5)
+    pd.DataFrame({'Wavelength[nm]': waves,
+                  'QE[%]': 60 * np.sin(np.linspace(0.1, 3.0, waves.size))}
+                 ).to_csv(path / 'midband_coated_QE.csv', index=False)
+    search_path = datasets.search_path
+    datasets.search_path = [path] + search_path
+    datasets.clear()
+    yield path
+    datasets.search_path = search_path
+    datasets.clear()
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmarks for `pytelescope.filters`, `cameras` and `datavolume`."""
+
+import numpy as np
+import pytest
+from astropy import units as u
+
+from pytelescope import cameras, datavolume, filters, orbiters
+
+
+@pytest.fixture()
+def camera():
+    return cameras.Camera(compression=5, fov=10, n_bandpasses=4,
+                          x=2048, y=2048, bits=12)
+
+
+def test_constant_filter_response(benchmark):
+    filt = filters.ConstantFilter(550, 40, 0.9)
+    benchmark(filt.response, 200 * u.nm, 1200 * u.nm)
+
+
+def test_filter_bank_response(benchmark):
+    bank = filters.FilterBank(np.linspace(300, 1100, 500), 40, 0.9)
+    benchmark(bank.response, 200 * u.nm, 1200 * u.nm)
+
+
+def test_camera_properties(benchmark, camera):
+    benchmark(lambda: (camera.ifov, camera.ifov_mrad, camera.img_set_size))
+
+
+def test_data_volume_grid(benchmark, camera):
+    orb = orbiters.MarsOrbiter(np.linspace(200, 1000, 10**4) * u.km)
+    benchmark(lambda: datavolume.DataVolume(
+        camera, orb, compression=np.linspace(1, 10, 10),
+        n_bandpasses=np.arange(1, 9)).table())
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmarks for `pytelescope.orbiters`."""
+
+import numpy as np
+import pytest
+from astropy import units as u
+
+from pytelescope import orbiters
+
+
+def test_slew_rate_single(benchmark):
+    benchmark(lambda: orbiters.MarsOrbiter(350 * u.km).slew_rate)
+
+
+@pytest.mark.parametrize('n', [10**4, 10**6])
+def test_slew_rate_sweep(benchmark, n):
+    alts = np.linspace(100, 2000, n) * u.km
+    benchmark(lambda: orbiters.MarsOrbiter(alts).slew_rate)
+
+
+def test_grid_table(benchmark):
+    alts = np.linspace(100, 2000, 10**5) * u.km
+    benchmark(lambda: orbiters.OrbiterGrid(['MARS', 'VENUS', 'EARTH'],
+                                           alts).table())
+
+
+@pytest.mark.parametrize('n', [10**4, 10**6])
+def test_elliptical_state(benchmark, n):
+    orb = orbiters.EllipticalOrbiter('VENUS', 250 * u.km, 66000 * u.km)
+    t = np.linspace(0, 10, n) * orb.T
+    benchmark(orb.state, t)
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmarks for `pytelescope.radiometry`."""
+
+import numpy as np
+import pytest
+from astropy import units as u
+
+from pytelescope import filters, radiometry, scenes
+
+
+@pytest.fixture()
+def rad(spectra_path):
+    return radiometry.Radiometry()
+
+
+def test_construction(benchmark, spectra_path):
+    benchmark(radiometry.Radiometry)
+
+
+def test_snr_single(benchmark, spectra_path):
+    benchmark(lambda: radiometry.Radiometry().SNR(0.01))
+
+
+def test_snr_repeated(benchmark, rad):
+    benchmark(rad.SNR, 0.01)
+
+
+@pytest.mark.parametrize('n', [10**2, 10**3])
+def test_snr_grid(benchmark, rad, n):
+    i = np.linspace(0, 85, n) * u.deg
+    d = np.linspace(0.7, 1.7, 10)
+    exp = np.logspace(-4, 0, n)
+    benchmark(rad.SNR_grid, i, d, exp)
+
+
+def test_scene_library_rates(benchmark, rad):
+    engine = scenes.SceneRates(rad, filters.FilterBank([450, 550, 650], 50))
+    library = np.random.default_rng(0).uniform(size=(10**4, rad.waves.size))
+    benchmark(engine.count_rates, library)
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+
+"""Content-addressed disk cache for array results.
+
+Entries are directories named by a hash of all inputs of a calculation and
+hold one .npy file per result array. Reads are memory-mapped, so processes
+sharing a cache directory reuse results without copying them. The total
+size of the cache is bounded by evicting the least recently used entries.
+"""
+
+import hashlib
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+from astropy import units as u
+
+
+def _update(digest, value):
+    if isinstance(value, u.Quantity):
+        _update(digest, value.value)
+        digest.update(str(value.unit).encode())
+    elif isinstance(value, dict):
+        for key in sorted(value):
+            digest.update(str(key).encode())
+            _update(digest, value[key])
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _update(digest, item)
+    elif isinstance(value, (str, bytes)):
+        digest.update(value if isinstance(value, bytes) else value.encode())
+    else:
+        array = np.ascontiguousarray(value)
+        digest.update(f"{array.dtype.str}{array.shape}".encode())
+        digest.update(array.tobytes())
+    digest.update(b'|')
+
+
+def hash_inputs(*values):
+    """Return hex digest identifying `values`.
+
+    Arrays are hashed by dtype, shape and content, Quantities by value and
+    unit, and dicts, lists and tuples by their items.
+    """
+    digest = hashlib.sha256()
+    for value in values:
+        _update(digest, value)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Size-bounded, content-addressed store of memory-mapped arrays.
+
+    Parameters
+    ----------
+    directory : str or pathlib.Path
+        Cache directory, may be shared between processes.
+    max_bytes : int
+        Size limit of all entries, least recently used entries are removed
+        when a new entry exceeds it.
+    """
+
+    def __init__(self, directory, max_bytes=2**30):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def _path(self, key):
+        return self.directory / key
+
+    def __contains__(self, key):
+        return self._path(key).is_dir()
+
+    def get(self, key):
+        """Return dict of read-only memory-mapped arrays stored under `key`.
+
+        Returns None if there is no such entry.
+        """
+        path = self._path(key)
+        try:
+            arrays = {f.stem: np.load(f, mmap_mode='r')
+                      for f in path.glob('*.npy')}
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return arrays or None
+
+    def put(self, key, arrays):
+        """Store dict of `arrays` under `key` and return them memory-mapped.
+
+        Concurrent writers of the same key are safe, the first one to finish
+        wins.
+        """
+        path = self._path(key)
+        tmp = path.with_name(f"{key}.{os.getpid()}.tmp")
+        tmp.mkdir(parents=True, exist_ok=True)
+        for name, array in arrays.items():
+            np.save(tmp / f"{name}.npy", np.asarray(array))
+        try:
+            os.rename(tmp, path)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)
+        self.evict(keep=key)
+        return self.get(key)
+
+    def entries(self):
+        "Return list of (mtime, size, path) of the entries, oldest first."
+        entries = []
+        if not self.directory.is_dir():
+            return entries
+        for path in self.directory.iterdir():
+            if not path.is_dir() or path.suffix == '.tmp':
+                continue
+            try:
+                size = sum(f.stat().st_size for f in path.iterdir())
+                entries.append((path.stat().st_mtime, size, path))
+            except FileNotFoundError:
+                continue
+        return sorted(entries)
+
+    @property
+    def size(self):
+        "Return total size of the entries in bytes."
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, keep=None):
+        "Remove least recently used entries until the size limit is met."
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path.name == keep:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        "Remove all entries."
+        for _, _, path in self.entries():
+            shutil.rmtree(path, ignore_errors=True)
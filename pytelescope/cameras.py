@@ -1,30 +1,140 @@
+import numpy as np
+import pandas as pd
+from astropy import units as u
+
+from .detectors import Detector
+from .utils import memoized
+
+
 class Camera(object):
-    def __init__(self, compression=5, fov=60,
-                 n_bandpasses=4, **kwargs):
+    """Frame camera with a detector.
+
+    Parameters
+    ----------
+    compression : float
+        Compression factor of the images
+    fov : float
+        Field of view in degrees
+    n_bandpasses : int
+        Number of bands per image set
+    detector : detectors.Detector, optional
+        Detector of the camera, created from `kwargs` if not given.
+    kwargs
+        Arguments for `detectors.Detector`.
 
+    Detector attributes are available on the camera as well. Derived
+    properties are memoized and recalculated after `compression`, `fov`,
+    `n_bandpasses` or `ccd` are reassigned; modifying the detector in place
+    requires reassigning `ccd`.
+    """
+
+    def __init__(self, compression=5, fov=60,
+                 n_bandpasses=4, detector=None, **kwargs):
+        self._cache = {}
         self.compression = compression
         self.fov = fov
         self.n_bandpasses = n_bandpasses
-        self.ccd = CCD(**kwargs)
+        self.ccd = Detector(**kwargs) if detector is None else detector
+
+    @property
+    def compression(self):
+        return self._compression
+
+    @compression.setter
+    def compression(self, value):
+        self._compression = value
+        self._cache.clear()
+
+    @property
+    def fov(self):
+        return self._fov
+
+    @fov.setter
+    def fov(self, value):
+        self._fov = value
+        self._cache.clear()
+
+    @property
+    def n_bandpasses(self):
+        return self._n_bandpasses
+
+    @n_bandpasses.setter
+    def n_bandpasses(self, value):
+        self._n_bandpasses = value
+        self._cache.clear()
+
+    @property
+    def ccd(self):
+        return self._ccd
 
-    def __getattr__(self, attr):
-        return getattr(self.ccd, attr)
+    @ccd.setter
+    def ccd(self, value):
+        self._ccd = value
+        self._cache.clear()
 
     @property
+    def detector(self):
+        return self.ccd
+
+    @property
+    def x(self):
+        return self.ccd.x
+
+    @property
+    def y(self):
+        return self.ccd.y
+
+    @property
+    def dynamic_range(self):
+        return self.ccd.dynamic_range
+
+    @property
+    def qe(self):
+        return self.ccd.qe
+
+    @property
+    def read_noise(self):
+        return self.ccd.read_noise
+
+    @property
+    def dark_current(self):
+        return self.ccd.dark_current
+
+    @property
+    def gain(self):
+        return self.ccd.gain
+
+    @property
+    def saturation(self):
+        return self.ccd.saturation
+
+    @property
+    def n_pixels(self):
+        return self.ccd.n_pixels
+
+    @property
+    def total_bits(self):
+        return self.ccd.total_bits
+
+    @property
+    def total_mbits(self):
+        return self.ccd.total_mbits
+
+    @memoized
     def ifov(self):
         ifovx = np.deg2rad(self.fov / self.ccd.x)
         ifovy = np.deg2rad(self.fov / self.ccd.y)
         return ifovx, ifovy
 
-    @property
+    @memoized
     def ifov_mrad(self):
         return self.ifov[0] * 1000, self.ifov[1] * 1000
 
-    @property
+    @memoized
     def img_compressed_size(self):
         return self.ccd.total_mbits / self.compression
 
-    @property
+    @memoized
     def img_set_size(self):
         return self.n_bandpasses * self.img_compressed_size
 
@@ -41,15 +151,82 @@ class Camera(object):
 
 
 class VMC(Camera):
+    pass
+
+
+class CameraCatalog:
+    """Many camera configurations stored as one array per parameter.
+
+    All properties of `Camera` are evaluated for the whole catalog at once.
+
+    Parameters
+    ----------
+    x, y, bits : array-like
+        Detector formats, see `detectors.Detector`.
+    compression, fov, n_bandpasses : array-like
+        Camera parameters, see `Camera`.
+    """
+    columns = ['x', 'y', 'bits', 'compression', 'fov', 'n_bandpasses']
+
+    def __init__(self, x, y, bits, compression=5, fov=60, n_bandpasses=4):
+        arrays = np.broadcast_arrays(x, y, bits, compression, fov,
+                                     n_bandpasses)
+        for name, array in zip(self.columns, arrays):
+            setattr(self, name, np.atleast_1d(array).copy())
+
+    @classmethod
+    def from_cameras(cls, cameras):
+        "Create catalog from a list of `Camera` objects."
+        return cls([cam.x for cam in cameras],
+                   [cam.y for cam in cameras],
+                   [cam.dynamic_range.to_value(u.bit) for cam in cameras],
+                   [cam.compression for cam in cameras],
+                   [cam.fov for cam in cameras],
+                   [cam.n_bandpasses for cam in cameras])
+
+    @classmethod
+    def from_frame(cls, df):
+        "Create catalog from a DataFrame with a column per parameter."
+        return cls(*[df[col].to_numpy() for col in cls.columns])
+
+    def __len__(self):
+        return self.x.size
 
+    def __getitem__(self, index):
+        "Return catalog entry `index` as `Camera`."
+        return Camera(self.compression[index], self.fov[index],
+                      self.n_bandpasses[index], x=self.x[index],
+                      y=self.y[index], bits=self.bits[index])
+
+    @property
+    def n_pixels(self):
+        return self.x * self.y
+
+    @property
+    def total_mbits(self):
+        return self.n_pixels * self.bits / 1e6 * u.Mbit
+
+    @property
+    def ifov(self):
+        return np.deg2rad(self.fov / self.x), np.deg2rad(self.fov / self.y)
+
+    @property
+    def ifov_mrad(self):
+        ifovx, ifovy = self.ifov
+        return ifovx * 1000, ifovy * 1000
+
+    @property
+    def img_compressed_size(self):
+        return self.total_mbits / self.compression
+
+    @property
+    def img_set_size(self):
+        return self.n_bandpasses * self.img_compressed_size
 
-class SolarIrradiance:
-    def __init__(self, wave1=200 * u.nm, wave2=1200 * u.nm, dlambda=1 * u.nm):
-        self.wave1 = wave1
-        self.wave2 = wave2
-        self.dlambda = dlambda
-        sol = SolarIrradianceSpectrum(TOTAL_IRRADIANCE_SPECTRUM_2000ASTM)
-        sol.interpolate(dlambda=dlambda.to(u.micron).value,
-                        ival_wavelength=(wave1.to(u.micron).value,
-                                         wave2.to(u.micron).value))
-        self.waves = sol.ipol_wavelength * u.micron  # b/c pyspectral works in micron
+    def to_frame(self):
+        "Return parameters and derived sizes as DataFrame."
+        df = pd.DataFrame({col: getattr(self, col) for col in self.columns})
+        df['ifov_x_mrad'], df['ifov_y_mrad'] = self.ifov_mrad
+        df['img_compressed_size'] = self.img_compressed_size.value
+        df['img_set_size'] = self.img_set_size.value
+        return df
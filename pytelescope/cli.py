@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+
+"""Command line interface, `pytelescope run config.yaml`.
+
+Only the standard library is imported at module level, the pytelescope
+modules (and with them astropy, pyspectral or SPICE) are loaded when a
+command actually needs them, so that `--help` returns immediately.
+
+The configuration file (YAML or JSON) has the optional sections `orbiter`,
+`camera`, `radiometry`, `filters` and `trade`, using the units of
+`trades.PARAMETERS`::
+
+    orbiter:
+      body: mars
+      alt: [300, 400]       # km
+    camera:
+      compression: 5
+      fov: 10               # deg
+      n_bandpasses: 4
+      detector: {x: 2048, y: 2048, bits: 12}
+    radiometry:
+      wave1: 200            # nm
+      wave2: 1200           # nm
+      dlambda: 1            # nm
+      i: 75                 # deg
+      d: 1.5                # AU
+      exp: 0.01             # s
+    filters:
+      - {center: 450, width: 50, transmission: 0.9}
+      - {center: 650, width: 50, transmission: 0.9, profile: gaussian}
+    trade:
+      output: trade.parquet
+      alt: [200, 300, 400]
+      exp: [0.005, 0.01]
+
+The trade study starts from the altitudes of `orbiter`, the format, bits and
+field of view of `camera` and the exposure time of `radiometry`, values in
+`trade` override them.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def read_config(path):
+    "Return configuration dict from YAML or JSON file `path`."
+    path = Path(path)
+    with open(path) as f:
+        if path.suffix == '.json':
+            return json.load(f)
+        import yaml
+
+        return yaml.safe_load(f) or {}
+
+
+def _jsonable(value):
+    "Return `value` with Quantities and arrays as plain JSON types."
+    import numpy as np
+    from astropy import units as u
+
+    if isinstance(value, dict):
+        return {key: _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    if isinstance(value, u.Quantity):
+        return {'value': np.asarray(value.value).tolist(),
+                'unit': str(value.unit)}
+    if isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    return value
+
+
+def make_filters(config):
+    """Create filters from the `filters` section of a configuration.
+
+    A dict is passed to `filters.FilterBank`, a list holds one dict per
+    filter with an optional 'profile' (constant, gaussian or trapezoid).
+    """
+    from . import filters
+
+    if config is None:
+        return None
+    if isinstance(config, dict):
+        return filters.FilterBank(**config)
+    profiles = {
+        'constant': filters.ConstantFilter,
+        'gaussian': filters.GaussianFilter,
+        'trapezoid': filters.TrapezoidFilter,
+    }
+    bank = []
+    for kwargs in config:
+        kwargs = dict(kwargs)
+        profile = kwargs.pop('profile', 'constant')
+        bank.append(profiles[profile](**kwargs))
+    return bank
+
+
+def evaluate(config, jobs=1, chunksize=100000):
+    """Evaluate the sections of `config`.
+
+    Parameters
+    ----------
+    config : dict
+        Configuration as described in the module docstring.
+    jobs : int
+        Worker processes for the trade study.
+    chunksize : int
+        Design points per chunk of the trade study.
+
+    Returns
+    -------
+    dict
+        Results per section, Quantities as dicts of value and unit.
+    """
+    from astropy import units as u
+
+    results = {}
+    camera = orbiter = rad = None
+    if 'orbiter' in config:
+        from .orbiters import Orbiter
+
+        section = config['orbiter']
+        orbiter = Orbiter(section['body'], section['alt'] * u.km)
+        d = {}
+        d['alt'] = orbiter.alt
+        d['v'] = orbiter.v
+        d['T'] = orbiter.T
+        d['v_surf'] = orbiter.v_surf
+        d['slew_rate'] = orbiter.slew_rate
+        results['orbiter'] = d
+    if 'camera' in config:
+        from .cameras import Camera
+
+        section = dict(config['camera'])
+        detector = section.pop('detector', {})
+        camera = Camera(**section, **detector)
+        d = {}
+        d['ifov_mrad'] = camera.ifov_mrad
+        d['total_mbits'] = camera.total_mbits
+        d['img_compressed_size'] = camera.img_compressed_size
+        d['img_set_size'] = camera.img_set_size
+        results['camera'] = d
+    bank = make_filters(config.get('filters'))
+    if {'radiometry', 'trade'} & set(config) or bank is not None:
+        from .radiometry import Radiometry
+
+        section = dict(config.get('radiometry', {}))
+        exp = section.pop('exp', 0.01)
+        kwargs = {key: section[key] * u.nm
+                  for key in ['wave1', 'wave2', 'dlambda'] if key in section}
+        if 'i' in section:
+            kwargs['i'] = section['i'] * u.deg
+        if 'd' in section:
+            kwargs['d'] = section['d']
+        rad = Radiometry(detector=None if camera is None else camera.ccd,
+                         **kwargs)
+        d = {}
+        d['signal_rate'] = rad.signal_rate
+        d['SNR'] = rad.SNR(exp)
+        if bank is not None:
+            rates = rad.band_signal_rates(bank)
+            d['band_signal_rates'] = rates
+            d['band_SNR'] = (rates.value * exp) ** 0.5
+        results['radiometry'] = d
+    if 'trade' in config:
+        from .trades import TradeStudy
+
+        # the other sections set the defaults, the trade section sweeps
+        params = {}
+        if orbiter is not None:
+            params['alt'] = orbiter.alt.to_value(u.km)
+        if camera is not None:
+            params['x'] = camera.x
+            params['y'] = camera.y
+            params['bits'] = camera.dynamic_range.to_value(u.bit)
+            params['fov'] = camera.fov
+        params['exp'] = exp
+        params.update(config['trade'])
+        output = params.pop('output', None)
+        body = params.pop('body', None)
+        if body is None:
+            if orbiter is None:
+                raise ValueError("The trade section needs a 'body' if the "
+                                 "configuration has no orbiter section.")
+            body = orbiter.body
+        study = TradeStudy(body, rad, bank, **params)
+        df = study.run(output, chunksize=chunksize, jobs=jobs)
+        if output is None:
+            results['trade'] = {col: df[col].to_numpy() for col in df}
+        else:
+            results['trade'] = {'output': str(output), 'rows': len(study)}
+    return _jsonable(results)
+
+
+def run(args):
+    if args.no_spice:
+        from . import orbiters
+
+        orbiters.use_spice = False
+    config = read_config(args.config)
+    results = evaluate(config, jobs=args.jobs, chunksize=args.chunksize)
+    if args.output is None:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='pytelescope',
+        description="Evaluate telescope, camera and orbit configurations.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    p = subparsers.add_parser(
+        'run', help="Evaluate a configuration file.",
+        description="Evaluate the orbiter, camera, radiometry, filters and "
+                    "trade sections of a YAML or JSON configuration and "
+                    "write the results as JSON.")
+    p.add_argument('config', help="YAML or JSON configuration file")
+    p.add_argument('-o', '--output',
+                   help="JSON result file, default is standard output")
+    p.add_argument('-j', '--jobs', type=int, default=1,
+                   help="Worker processes for the trade study (default 1)")
+    p.add_argument('--chunksize', type=int, default=100000,
+                   help="Design points per trade study chunk")
+    p.add_argument('--no-spice', action='store_true',
+                   help="Use bundled body constants instead of SPICE")
+    p.set_defaults(func=run)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
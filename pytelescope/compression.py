@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+"""Achievable lossless compression of detector images.
+
+Ratios are estimated per tile with entropy estimates and the lossless codecs
+of the standard library, and relate the compressed size to the raw size at
+the detector's bit depth, like `Camera.compression`.
+"""
+
+import bz2
+import lzma
+import math
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from astropy import units as u
+
+METHODS = ['entropy', 'entropy_diff', 'zlib', 'bz2', 'lzma']
+
+CODECS = {
+    'zlib': lambda data: zlib.compress(data, 9),
+    'bz2': lambda data: bz2.compress(data, 9),
+    'lzma': lambda data: lzma.compress(data, preset=6),
+}
+
+
+def residuals(tile):
+    """Return differences to the left neighbour as unsigned integers.
+
+    This is the prediction step of lossless image compressors, signed
+    differences are zigzag-encoded (0, -1, 1, -2, ... to 0, 1, 2, 3, ...).
+    """
+    d = np.diff(np.asarray(tile, dtype='int64'), axis=-1, prepend=0)
+    return (d << 1) ^ (d >> 63)
+
+
+def entropy(values):
+    "Return zeroth-order Shannon entropy of integer `values` in bits/value."
+    counts = np.bincount(np.ravel(values))
+    p = counts[counts > 0] / counts.sum()
+    return float(-(p * np.log2(p)).sum())
+
+
+def compressed_bits(tile, bits, methods=METHODS):
+    """Return compressed size of `tile` in bits for each of `methods`.
+
+    Parameters
+    ----------
+    tile : np.ndarray
+        Non-negative integer DNs
+    bits : int
+        Bit depth of the DNs
+    methods : list of str
+        Names from `METHODS`. 'entropy' uses the DN histogram, all others
+        the residuals of `residuals`, packed into the smallest integer type.
+    """
+    res = residuals(tile)
+    packed = None
+    d = {}
+    for method in methods:
+        if method == 'entropy':
+            d[method] = entropy(tile) * np.size(tile)
+        elif method == 'entropy_diff':
+            d[method] = entropy(res) * res.size
+        else:
+            if packed is None:
+                dtype = np.min_scalar_type(2**(bits + 1))
+                packed = np.ascontiguousarray(res, dtype=dtype).tobytes()
+            d[method] = 8 * len(CODECS[method](packed))
+    return d
+
+
+def _tiles(images, tile):
+    images = np.asanyarray(images)
+    n_lines, n_samples = images.shape[-2:]
+    frames = images.reshape((-1, n_lines, n_samples))
+    lines, samples = tile
+    for frame in frames:
+        for i in range(0, n_lines, lines):
+            for j in range(0, n_samples, samples):
+                yield frame[i:i + lines, j:j + samples]
+
+
+def estimate_compression(images, bits, methods=METHODS, tile=(256, 256),
+                         jobs=None):
+    """Return compression ratios achievable for `images`.
+
+    Parameters
+    ----------
+    images : array-like
+        Image or stack of images with DNs, e.g. from
+        `frames.FrameSimulator.run`. Memory-mapped stacks are read per tile.
+    bits : int
+        Bit depth of the DNs, the raw size is `bits` per pixel.
+    methods : list of str
+        Names from `METHODS`
+    tile : tuple of int
+        Lines and samples per tile, each tile is compressed independently.
+    jobs : int, optional
+        Number of threads, default is chosen by `ThreadPoolExecutor`.
+
+    Returns
+    -------
+    dict
+        Ratio of raw to compressed size for each method. Entropy methods
+        are estimates of the best possible ratio for their model.
+    """
+    totals = dict.fromkeys(methods, 0.0)
+    raw = 0
+
+    def work(data):
+        return np.size(data), compressed_bits(np.asarray(data), bits,
+                                              methods)
+
+    with ThreadPoolExecutor(jobs) as executor:
+        for n_pixels, sizes in executor.map(work, _tiles(images, tile)):
+            raw += n_pixels * bits
+            for method, size in sizes.items():
+                totals[method] += size
+    return {method: raw / size if size else math.inf
+            for method, size in totals.items()}
+
+
+def calibrate(camera, images, method='lzma', **kwargs):
+    """Set `camera.compression` to the ratio achieved for `images`.
+
+    `Camera.img_compressed_size`, `Camera.img_set_size` and data volumes
+    created with the camera afterwards use the estimated ratio.
+
+    Parameters
+    ----------
+    camera : cameras.Camera
+        Camera to update, its `dynamic_range` is the bit depth.
+    images : array-like
+        Representative images
+    method : str
+        Name from `METHODS` to use
+    kwargs
+        Arguments for `estimate_compression`.
+
+    Returns
+    -------
+    float
+        The new compression factor
+    """
+    bits = int(camera.dynamic_range.to_value(u.bit))
+    ratios = estimate_compression(images, bits, methods=[method], **kwargs)
+    camera.compression = ratios[method]
+    return camera.compression
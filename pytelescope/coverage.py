@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+
+"""Surface coverage of a camera on a circular orbit."""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from astropy import units as u
+
+from .utils import ordered_map
+
+# Sidereal rotation periods, negative for retrograde rotation.
+ROTATION_PERIODS = {
+    'MERCURY': 58.6462 * u.day,
+    'VENUS': -243.0185 * u.day,
+    'EARTH': 0.99726968 * u.day,
+    'MOON': 27.321661 * u.day,
+    'MARS': 1.02595676 * u.day,
+    'JUPITER': 9.925 * u.hour,
+    'SATURN': 10.656 * u.hour,
+    'URANUS': -17.24 * u.hour,
+    'NEPTUNE': 16.11 * u.hour,
+}
+
+_worker = {}
+
+
+def _init_worker(*args):
+    "Store the arguments of `_count_orbits` once per worker process."
+    _worker['args'] = args
+
+
+def _count_orbits(start, stop, rows, starts, widths, shape, lon_per_orbit,
+                  resolution):
+    """Return revisit counts of orbits `start` to `stop`.
+
+    The swath intervals `rows`, `starts` and `widths` of the first orbit
+    (see `Coverage.swath_intervals`) move west by `lon_per_orbit` degrees per
+    orbit on a grid of `shape` with cells of `resolution` degrees.
+    """
+    n_lat, n_lon = shape
+    res = resolution
+    counts = np.zeros(n_lat * n_lon, dtype=np.min_scalar_type(stop - start))
+    for orbit in range(start, stop):
+        lon = starts - orbit * lon_per_orbit
+        first = np.ceil(lon / res - 0.5).astype('intp')
+        last = np.floor((lon + widths) / res - 0.5).astype('intp')
+        length = np.clip(last - first + 1, 0, n_lon)
+        # flat indices of all cells of all intervals
+        total = length.sum()
+        offsets = np.repeat(np.cumsum(length) - length, length)
+        cells = np.arange(total) - offsets + np.repeat(first, length)
+        cells %= n_lon
+        cells += np.repeat(rows * n_lon, length)
+        # buffered fancy indexing adds once per cell, even where
+        # intervals overlap
+        counts[cells] += 1
+    return counts.reshape(n_lat, n_lon)
+
+
+def _count_worker_orbits(start, stop):
+    return _count_orbits(start, stop, *_worker['args'])
+
+
+class Coverage:
+    """Revisit counts of camera footprints on a lat/lon grid of the body.
+
+    The swath of the camera is swept along the ground track of every orbit,
+    with the body rotating underneath, and each grid cell counts the orbits
+    that covered it.
+
+    Parameters
+    ----------
+    orbiter : orbiters.Orbiter
+        Orbiter with scalar `alt`.
+    camera : cameras.Camera
+        Camera pointing at nadir, its `fov` spanning the swath.
+    inclination : astropy.unit.angle
+        Orbit inclination
+    raan : astropy.unit.angle
+        Right ascension of the ascending node at the start
+    rotation_period : astropy.unit.time, optional
+        Sidereal rotation period of the body, default from
+        `ROTATION_PERIODS`.
+    resolution : float
+        Grid cell size in degrees
+    """
+
+    def __init__(self, orbiter, camera, inclination=90 * u.deg,
+                 raan=0 * u.deg, rotation_period=None, resolution=0.5):
+        self.orbiter = orbiter
+        self.camera = camera
+        self.inclination = inclination
+        self.raan = raan
+        if rotation_period is None:
+            rotation_period = ROTATION_PERIODS[orbiter.body.upper()]
+        self.rotation_period = rotation_period
+        self.resolution = resolution
+
+    @property
+    def shape(self):
+        return (round(180 / self.resolution), round(360 / self.resolution))
+
+    @property
+    def lats(self):
+        "Return latitudes of the grid cell centers in degrees."
+        return -90 + (np.arange(self.shape[0]) + 0.5) * self.resolution
+
+    @property
+    def lons(self):
+        "Return east longitudes of the grid cell centers in degrees."
+        return (np.arange(self.shape[1]) + 0.5) * self.resolution
+
+    @property
+    def swath_width(self):
+        "Return width of the footprint across track at nadir."
+        half = np.deg2rad(self.camera.fov) / 2
+        return (2 * self.orbiter.alt * np.tan(half)).to(u.km)
+
+    @property
+    def lon_per_orbit(self):
+        "Return rotation of the body during one orbit in degrees."
+        return 360 * (self.orbiter.T / self.rotation_period).decompose().value
+
+    def swath_intervals(self):
+        """Return longitude intervals covered by the swath in the first orbit.
+
+        A cell is covered if its centre is within half the swath width of
+        the ground track. On each latitude row of the grid these cells form
+        up to two longitude intervals, one per pass over that latitude, or
+        the whole row near the poles. The interval ends are found in the
+        inertial frame and moved west by the body rotation until the time
+        the orbiter passes them, so the intervals follow the body-fixed
+        ground track.
+
+        Returns
+        -------
+        rows : np.ndarray
+            Latitude row index of each interval
+        starts : np.ndarray
+            Body-fixed east longitudes of the interval starts in degrees
+        widths : np.ndarray
+            Interval widths in degrees
+        """
+        R_body = self.orbiter.R_body.to_value(u.km)
+        half_angle = self.swath_width.to_value(u.km) / 2 / R_body
+        inc = self.inclination.to_value(u.rad)
+        raan = self.raan.to_value(u.rad)
+        e1 = np.array([math.cos(raan), math.sin(raan), 0])
+        e2 = np.array([-math.sin(raan) * math.cos(inc),
+                       math.cos(raan) * math.cos(inc), math.sin(inc)])
+        lat = np.deg2rad(self.lats)
+        # distance to the orbit plane, sin(h) >= |cos(i) sin(lat) -
+        # sin(i) cos(lat) sin(lon - raan)|, bounds sin(lon - raan)
+        center = math.cos(inc) * np.sin(lat)
+        scale = max(math.sin(inc), 1e-12) * np.cos(lat)
+        low = (center - math.sin(half_angle)) / scale
+        high = (center + math.sin(half_angle)) / scale
+        full = (low <= -1) & (high >= 1)
+        partial = ~full & (low <= 1) & (high >= -1)
+        rows = np.flatnonzero(partial)
+        a1 = np.arcsin(np.clip(low[partial], -1, 1))
+        a2 = np.arcsin(np.clip(high[partial], -1, 1))
+        begin = raan + np.concatenate([a1, math.pi - a2])
+        end = raan + np.concatenate([a2, math.pi - a1])
+        rows = np.concatenate([rows, rows])
+
+        def arg_of_latitude(lon):
+            "Return orbit position abreast of inertial `lon` on the rows."
+            p = np.stack([np.cos(lat[rows]) * np.cos(lon),
+                          np.cos(lat[rows]) * np.sin(lon), np.sin(lat[rows])])
+            return np.arctan2(e2 @ p, e1 @ p)
+
+        # the interval ends are passed at different times, continue the
+        # orbit position from the centre so that intervals across the
+        # ascending node don't wrap
+        mid = np.mod(arg_of_latitude((begin + end) / 2), math.tau)
+        u_begin = mid + np.angle(np.exp(1j * (arg_of_latitude(begin) - mid)))
+        u_end = mid + np.angle(np.exp(1j * (arg_of_latitude(end) - mid)))
+        per_rad = self.lon_per_orbit / math.tau
+        full_rows = np.flatnonzero(full)
+        rows = np.concatenate([rows, full_rows])
+        starts = np.concatenate([np.degrees(begin) - u_begin * per_rad,
+                                 np.zeros(full_rows.size)])
+        widths = np.concatenate([np.degrees(end - begin)
+                                 - (u_end - u_begin) * per_rad,
+                                 np.full(full_rows.size, 360.0)])
+        return rows, starts, widths
+
+    def _initargs(self):
+        return self.swath_intervals() + (self.shape, self.lon_per_orbit,
+                                         self.resolution)
+
+    def chunks(self, n_orbits, chunksize=100, jobs=None, first=0):
+        """Yield revisit counts for consecutive chunks of orbits.
+
+        Parameters
+        ----------
+        n_orbits : int
+            Number of orbits
+        chunksize : int
+            Orbits per chunk
+        jobs : int, optional
+            Number of worker processes, default is the number of CPUs, 1 to
+            evaluate in this process.
+        first : int
+            Index of the first orbit, to continue an earlier run.
+
+        Yields
+        ------
+        np.ndarray
+            Counts of the grid shape, in the smallest sufficient integer type.
+
+        At most two chunks per worker are evaluated ahead of the consumer.
+        """
+        stop = first + n_orbits
+        bounds = [(start, min(start + chunksize, stop))
+                  for start in range(first, stop, chunksize)]
+        if not bounds:
+            return
+        args = self._initargs()
+        if jobs == 1:
+            for start, stop in bounds:
+                yield _count_orbits(start, stop, *args)
+            return
+        window = 2 * (jobs or os.cpu_count())
+        with ProcessPoolExecutor(jobs, initializer=_init_worker,
+                                 initargs=args) as executor:
+            yield from ordered_map(executor, _count_worker_orbits, bounds,
+                                   window)
+
+    def run(self, n_orbits, chunksize=100, jobs=None, first=0, counts=None):
+        """Return revisit counts after `n_orbits` orbits.
+
+        Parameters
+        ----------
+        n_orbits, chunksize, jobs, first
+            See `chunks`.
+        counts : np.ndarray, optional
+            Counts to add to, e.g. from an earlier call with the orbits
+            before `first`. It is updated in place if its integer type can
+            hold `first + n_orbits`, otherwise a promoted copy is returned.
+
+        Returns
+        -------
+        np.ndarray
+            Orbits covering each grid cell, of shape `shape`.
+        """
+        dtype = np.min_scalar_type(first + n_orbits)
+        if counts is None:
+            counts = np.zeros(self.shape, dtype)
+        elif not np.can_cast(dtype, counts.dtype):
+            counts = counts.astype(np.promote_types(counts.dtype, dtype))
+        for chunk in self.chunks(n_orbits, chunksize=chunksize, jobs=jobs,
+                                 first=first):
+            counts += chunk
+        return counts
+
+    def fraction(self, counts, min_visits=1):
+        "Return area fraction of the body with at least `min_visits`."
+        weights = np.cos(np.deg2rad(self.lats))[:, np.newaxis]
+        covered = (counts >= min_visits) * weights
+        return covered.sum() / (weights.sum() * self.shape[1])
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+
+"""Registry of the tabulated data (QE curves, spectra, filters) used here.
+
+Data files are looked up by name in the directories of `search_path`, which
+starts with the directories listed in the PYTELESCOPE_DATA environment
+variable, followed by the data directory shipped with the package.
+Parsed tables are kept in memory and cached as .npz files in `cache_dir`,
+so that CSV parsing happens only once per file and set of read options.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+package_data = Path(__file__).parent / 'data'
+
+search_path = [Path(p) for p in
+               os.environ.get('PYTELESCOPE_DATA', '').split(os.pathsep)
+               if p] + [package_data]
+
+
+def _user_cache_dir():
+    base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'pytelescope'
+
+
+# Directory for the .npz caches, PYTELESCOPE_CACHE_DIR or the user's cache
+# directory, never the package itself.
+cache_dir = os.environ.get('PYTELESCOPE_CACHE_DIR') or _user_cache_dir()
+
+registry = {}
+
+_tables = {}
+
+
+def register(name, fname, **read_csv_kwargs):
+    """Register a CSV data file under `name`.
+
+    Parameters
+    ----------
+    name : str
+        Name to load the table with.
+    fname : str or pathlib.Path
+        File name, relative paths are resolved against `search_path`.
+    read_csv_kwargs
+        Keyword arguments for `pandas.read_csv`.
+    """
+    registry[name] = dict(fname=fname, read_csv_kwargs=read_csv_kwargs)
+    _tables.pop(name, None)
+
+
+register('cmosis_mono_qe', 'cmosis_mono_qe.csv')
+register('giza_crism_blue_halos', 'giza_crism_blue_halos.csv')
+register('midband_coated_QE', 'midband_coated_QE.csv')
+register('akatsuki_cameras', 'akatsuki_cameras.csv', index_col=0)
+
+
+def find(name):
+    "Return path of the data file registered as `name`."
+    fname = Path(registry[name]['fname'])
+    if fname.is_absolute():
+        candidates = [fname]
+    else:
+        candidates = [Path(p) / fname for p in search_path]
+    for path in candidates:
+        if path.exists():
+            return path
+    raise FileNotFoundError(
+        f"Data file {fname} for '{name}' not found in "
+        f"{[str(p.parent) for p in candidates]}.")
+
+
+def _cache_file(path, read_csv_kwargs):
+    key = repr((str(path.resolve()), sorted(read_csv_kwargs.items())))
+    digest = hashlib.md5(key.encode()).hexdigest()[:12]
+    return Path(cache_dir) / f"{path.stem}-{digest}.npz"
+
+
+def _to_array(values):
+    "Return `values` as array that can be stored without pickling."
+    values = np.asarray(values)
+    if values.dtype == object:
+        if not all(isinstance(v, str) for v in values):
+            return None
+        values = values.astype(str)
+    return values
+
+
+def _write_cache(df, fname):
+    arrays = [_to_array(df.index)]
+    arrays += [_to_array(df[col]) for col in df.columns]
+    if any(a is None for a in arrays):
+        return
+    d = {f"c{i}": a for i, a in enumerate(arrays[1:])}
+    d['index'] = arrays[0]
+    d['names'] = np.array([str(df.index.name)] + list(df.columns))
+    try:
+        fname.parent.mkdir(parents=True, exist_ok=True)
+        tmpname = fname.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmpname, 'wb') as f:
+            np.savez(f, **d)
+        os.replace(tmpname, fname)
+    except OSError:
+        pass
+
+
+def _read_cache(fname):
+    with np.load(fname) as npz:
+        names = list(npz['names'])
+        df = pd.DataFrame({name: npz[f"c{i}"]
+                           for i, name in enumerate(names[1:])},
+                          index=npz['index'])
+    df.index.name = None if names[0] == 'None' else names[0]
+    return df
+
+
+def _read(name):
+    path = find(name)
+    read_csv_kwargs = registry[name]['read_csv_kwargs']
+    cache = _cache_file(path, read_csv_kwargs)
+    if cache.exists() and cache.stat().st_mtime >= path.stat().st_mtime:
+        return _read_cache(cache)
+    df = pd.read_csv(path, **read_csv_kwargs)
+    _write_cache(df, cache)
+    return df
+
+
+def load(name):
+    """Return the table registered as `name` as DataFrame.
+
+    The file is parsed on first access only, later calls return copies of
+    the in-memory table.
+    """
+    try:
+        df = _tables[name]
+    except KeyError:
+        df = _tables[name] = _read(name)
+    return df.copy()
+
+
+def clear():
+    "Clear the in-memory tables, e.g. after changing `search_path`."
+    _tables.clear()
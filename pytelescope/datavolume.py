@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+"""Data volume planning for a camera on an orbiter."""
+
+import numpy as np
+from astropy import units as u
+
+from .utils import AltitudeGrid, outer_grid
+
+
+class DataVolume(AltitudeGrid):
+    """Images and data volume of a frame camera imaging along its orbit.
+
+    Results are broadcast over a grid with one axis for each array-valued
+    input, in the order altitude (from `orbiter.alt`), compression and number
+    of bands.
+
+    Parameters
+    ----------
+    camera : cameras.Camera
+        Camera taking the images, lines (`x`) pointing along-track.
+    orbiter : orbiters.Orbiter
+        Orbiter carrying the camera, `alt` may be a 1D array.
+    compression : float or array-like, optional
+        Compression factor(s), default is `camera.compression`.
+    n_bandpasses : int or array-like, optional
+        Number(s) of bands per image set, default is `camera.n_bandpasses`.
+    overlap : float
+        Along-track overlap between consecutive images as fraction of the
+        footprint.
+    duty_cycle : float
+        Fraction of each orbit that is imaged, e.g. 0.5 for dayside only.
+    downlink_time : astropy.unit.time
+        Time available for downlink per day.
+    """
+
+    table_keys = ['compression', 'n_bandpasses', 'footprint', 'image_interval',
+                  'images_per_orbit', 'mbits_per_image', 'mbits_per_orbit',
+                  'orbits_per_day', 'mbits_per_day', 'downlink_rate']
+
+    def __init__(self, camera, orbiter, compression=None, n_bandpasses=None,
+                 overlap=0.1, duty_cycle=0.5, downlink_time=8 * u.hour):
+        self.camera = camera
+        self.orbiter = orbiter
+        if compression is None:
+            compression = camera.compression
+        if n_bandpasses is None:
+            n_bandpasses = camera.n_bandpasses
+        alt, self.compression, self.n_bandpasses = outer_grid(
+            orbiter.alt, compression, n_bandpasses)
+        self.alt_shape = np.shape(alt)
+        self.overlap = overlap
+        self.duty_cycle = duty_cycle
+        self.downlink_time = downlink_time
+
+    @property
+    def footprint(self):
+        "Return along-track length of an image footprint at nadir."
+        alt = self._along_alt(self.orbiter.alt)
+        return (alt * self.camera.ifov[0] * self.camera.ccd.x).to(u.km)
+
+    @property
+    def image_interval(self):
+        "Return time between consecutive images."
+        v_surf = self._along_alt(self.orbiter.v_surf)
+        return (self.footprint * (1 - self.overlap) / v_surf).to(u.s)
+
+    @property
+    def images_per_orbit(self):
+        "Return number of image sets per orbit."
+        T = self._along_alt(self.orbiter.T)
+        return np.ceil((self.duty_cycle * T / self.image_interval)
+                       .decompose().value)
+
+    @property
+    def mbits_per_image(self):
+        "Return compressed size of one single-band image."
+        return self.camera.ccd.total_mbits / self.compression
+
+    @property
+    def mbits_per_orbit(self):
+        return self.images_per_orbit * self.n_bandpasses * \
+            self.mbits_per_image
+
+    @property
+    def orbits_per_day(self):
+        T = self._along_alt(self.orbiter.T)
+        return (1 * u.day / T).decompose().value
+
+    @property
+    def mbits_per_day(self):
+        return self.mbits_per_orbit * self.orbits_per_day
+
+    @property
+    def downlink_rate(self):
+        "Return downlink rate required to transmit a day of data."
+        return (self.mbits_per_day / self.downlink_time).to(u.kbit / u.s)
@@ -1,7 +1,81 @@
-from astropy import units as u
+import numpy as np
 import pandas as pd
-from matplotlib import pyplot as plt
-from astropy.visualization import quantity_support
+from astropy import units as u
+
+from . import datasets
+
+
+class QECurve:
+    """Compact quantum efficiency curve on contiguous float64 arrays.
+
+    Resampled curves are cached per wavelength grid, so that repeated
+    requests for the same grid cost only a lookup.
+
+    Parameters
+    ----------
+    waves : array-like
+        Wavelengths in nm
+    qe : array-like
+        Quantum efficiency as fraction, zero outside of `waves`.
+    """
+    __slots__ = ('waves', 'qe', '_resampled')
+
+    def __init__(self, waves, qe):
+        waves = np.asarray(waves, dtype='float')
+        qe = np.asarray(qe, dtype='float')
+        order = np.argsort(waves, kind='stable')
+        self.waves = np.ascontiguousarray(waves[order])
+        self.qe = np.ascontiguousarray(qe[order])
+        self.waves.setflags(write=False)
+        self.qe.setflags(write=False)
+        self._resampled = {}
+
+    @classmethod
+    def from_any(cls, qe):
+        """Create QECurve from the supported QE representations.
+
+        Parameters
+        ----------
+        qe : QECurve, QE, pd.DataFrame, pd.Series or str
+            DataFrames hold wavelengths [nm] and QE [%] in their first two
+            columns, Series hold QE [%] indexed by wavelength [nm]. Strings
+            are passed to `QE`.
+        """
+        if isinstance(qe, cls):
+            return qe
+        if isinstance(qe, str):
+            qe = QE(qe)
+        if isinstance(qe, QE):
+            return qe.curve
+        if isinstance(qe, pd.DataFrame):
+            return cls(qe.iloc[:, 0], qe.iloc[:, 1] / 100)
+        if isinstance(qe, pd.Series):
+            return cls(qe.index, qe.values / 100)
+        raise TypeError(f"Can't create QE curve from {type(qe)}.")
+
+    def __len__(self):
+        return self.waves.size
+
+    def resample(self, waves):
+        """Return QE at `waves` [nm] as read-only array.
+
+        Results are cached for the 8 most recently used grids.
+        """
+        waves = np.asarray(waves, dtype='float')
+        # keyed on the full content, so that different grids never collide
+        key = (waves.shape, waves.tobytes())
+        try:
+            # move to the end, the dict is ordered by last use
+            qe = self._resampled[key] = self._resampled.pop(key)
+            return qe
+        except KeyError:
+            pass
+        if len(self._resampled) >= 8:
+            del self._resampled[next(iter(self._resampled))]
+        qe = np.interp(waves, self.waves, self.qe, left=0.0, right=0.0)
+        qe.setflags(write=False)
+        self._resampled[key] = qe
+        return qe
 
 
 class Detector(object):
@@ -15,15 +89,29 @@ class Detector(object):
         Number of samples
     bits : int
         Dynamic range for digitization
-    qe : pd.Series
-        Quantum efficiency data for the detector.
-
+    qe : QECurve, QE, pd.DataFrame, pd.Series or str, optional
+        Quantum efficiency data for the detector, stored as `QECurve`.
+    read_noise : float
+        Read noise in electrons (rms)
+    dark_current : float
+        Dark current in electrons/s
+    gain : float
+        Conversion gain in electrons/DN
+
+    With `fast` set to True, `total_mbits` is calculated from plain numbers,
+    attaching the unit only to the result.
     """
+    fast = False
 
-    def __init__(self, x, y, bits, qe):
+    def __init__(self, x, y, bits, qe=None, read_noise=0.0,
+                 dark_current=0.0, gain=1.0):
         self.x = x
         self.y = y
         self.dynamic_range = bits * u.bit
+        self.qe = None if qe is None else QECurve.from_any(qe)
+        self.read_noise = read_noise
+        self.dark_current = dark_current
+        self.gain = gain
 
     @property
     def n_pixels(self):
@@ -33,8 +121,16 @@ class Detector(object):
     def total_bits(self):
         return self.n_pixels * self.dynamic_range
 
+    @property
+    def saturation(self):
+        "Return signal in electrons at the maximum digital number."
+        return (2**self.dynamic_range.to_value(u.bit) - 1) * self.gain
+
     @property
     def total_mbits(self):
+        if self.fast:
+            bits = self.n_pixels * self.dynamic_range.to_value(u.bit)
+            return u.Quantity(bits / 1e6, u.Mbit)
         return self.total_bits.to(u.Mbit)
 
     def __repr__(self):
@@ -49,27 +145,47 @@ class Detector(object):
 
 
 class QE:
+    """Quantum efficiency curve.
+
+    Parameters
+    ----------
+    fname : str or pathlib.Path
+        Name of a table in `datasets.registry` or path to a CSV file with
+        'waves' [nm] and 'qe' [%] columns.
+    """
+
     def __init__(self, fname):
-        self.df = pd.read_csv(fname)
+        if fname in datasets.registry:
+            self.df = datasets.load(fname)
+        else:
+            self.df = pd.read_csv(fname)
         self.df = self.df.sort_values(by='waves')
+        self.curve = QECurve(self.df.waves, self.df.qe / 100)
 
     @property
     def waves(self):
-        return self.df.waves.values * u.nm
+        return self.curve.waves << u.nm
 
     @property
     def qe(self):
-        return self.df.qe.values * u.percent
+        return (self.curve.qe * 100) << u.percent
 
     def plot(self):
+        from astropy.visualization import quantity_support
+        from matplotlib import pyplot as plt
+
         with quantity_support():
             plt.figure()
             plt.plot(self.waves, self.qe)
             plt.title('QE')
 
 
-cmosis_qe = QE(
-    "/Users/klay6683/Dropbox/Documents/proposals/2018/VDO/cmosis_mono_qe.csv")
+def __getattr__(name):
+    # load module level data on first access only
+    if name == 'cmosis_qe':
+        value = globals()[name] = QE('cmosis_mono_qe')
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # class
 #     def __init__(self, x, y, bits, qe_)
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+"""Exposure time planning for a target SNR."""
+
+import numpy as np
+
+
+class NoiseModel:
+    """Shot, dark current and read noise of one detector pixel.
+
+    Signal rates are in electrons/s, e.g. the value of
+    `Radiometry.signal_rate`, and exposure times in seconds. All methods
+    broadcast over array arguments.
+
+    Parameters
+    ----------
+    read_noise : float
+        Read noise in electrons (rms)
+    dark_current : float
+        Dark current in electrons/s
+    saturation : float
+        Signal in electrons that saturates the pixel, infinite if None.
+    """
+
+    def __init__(self, read_noise=0.0, dark_current=0.0, saturation=None):
+        self.read_noise = read_noise
+        self.dark_current = dark_current
+        self.saturation = np.inf if saturation is None else saturation
+
+    @classmethod
+    def from_detector(cls, detector):
+        "Create NoiseModel from a `detectors.Detector`."
+        return cls(detector.read_noise, detector.dark_current,
+                   detector.saturation)
+
+    def noise(self, rate, exp):
+        "Return total noise in electrons."
+        rate = np.asanyarray(rate)
+        return np.sqrt((rate + self.dark_current) * exp + self.read_noise**2)
+
+    def SNR(self, rate, exp):
+        "Return signal to noise ratio for `rate` and exposure time `exp`."
+        return rate * exp / self.noise(rate, exp)
+
+    def exposure(self, rate, snr):
+        """Return exposure time that reaches `snr` for signal `rate`.
+
+        Solves SNR**2 * ((rate + dark) * t + read**2) = (rate * t)**2.
+        """
+        rate = np.asanyarray(rate, dtype='float')
+        snr2 = np.asanyarray(snr, dtype='float')**2
+        b = snr2 * (rate + self.dark_current)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return (b + np.sqrt(b**2 + 4 * rate**2 * snr2 *
+                                self.read_noise**2)) / (2 * rate**2)
+
+    def max_exposure(self, rate):
+        "Return exposure time at which the pixel saturates."
+        with np.errstate(divide='ignore'):
+            return self.saturation / (np.asanyarray(rate) + self.dark_current)
+
+    def saturation_margin(self, rate, exp):
+        "Return unused fraction of the saturation signal."
+        signal = (np.asanyarray(rate) + self.dark_current) * exp
+        return 1 - signal / self.saturation
+
+
+def required_exposure(rate, snr, noise=None):
+    """Return exposure times that reach target SNRs.
+
+    Parameters
+    ----------
+    rate : float or array-like
+        Signal rates in electrons/s, e.g. the value of
+        `Radiometry.signal_rate` or `Radiometry.signal_rate_grid`.
+    snr : float or array-like
+        Target SNR, broadcast against `rate`.
+    noise : NoiseModel, optional
+        Noise model, shot noise only if not given.
+
+    Returns
+    -------
+    dict
+        'exp' with the exposure times in seconds, 'saturation_margin' and
+        'saturated', which flags scenes that saturate before reaching `snr`.
+    """
+    if noise is None:
+        noise = NoiseModel()
+    rate = getattr(rate, 'value', rate)
+    exp = noise.exposure(rate, snr)
+    margin = noise.saturation_margin(rate, exp)
+    d = {}
+    d['exp'] = exp
+    d['saturation_margin'] = margin
+    d['saturated'] = margin < 0
+    return d
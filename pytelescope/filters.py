@@ -1,17 +1,36 @@
-import pandas as pd
+import math
+
 import numpy as np
+from scipy.special import ndtr
+
+from . import datasets
+
 
-fname = "/Users/klay6683/Dropbox/Documents/VENUS/VDO/akatsuki_cameras.csv"
-akatsuki_filters = pd.read_csv(fname, index_col=0)
+def __getattr__(name):
+    # load module level data on first access only
+    if name == 'akatsuki_filters':
+        value = globals()[name] = datasets.load('akatsuki_cameras')
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class Filter:
     """Base Filter class
 
+    Subclasses define the transmission profile with `transmission_at` and
+    its antiderivatives, which allow exact band integrals of sampled spectra
+    without resampling them to `resolution`.
+
     Parameters
     ----------
+    center : float
+        Center wavelength in nm
+    width : float
+        Width of the band in nm
+    transmission : float
+        Peak transmission
     res : float
-        Resolution of
+        Resolution of the wavelength grid for `response` in nm
     """
 
     def __init__(self, center, width, transmission, res=1):
@@ -20,6 +39,57 @@ class Filter:
         self.transmission = transmission
         self.resolution = res
 
+    def transmission_at(self, waves):
+        "Return transmission at `waves` [nm]."
+        raise NotImplementedError
+
+    def _antiderivatives(self, waves):
+        "Return integrals of T(x) and (x - center) * T(x) up to `waves`."
+        raise NotImplementedError
+
+    def response(self, wave1, wave2):
+        waves = np.arange(wave1.value,
+                          wave2.value+self.resolution,
+                          self.resolution, dtype='float')
+        d = {}
+        d['wavelength'] = waves
+        d['response'] = self.transmission_at(waves)
+        return d
+
+    def band_weights(self, waves):
+        """Return weights to integrate spectra sampled at `waves` over band.
+
+        The integral of the filter profile times the linear interpolation of
+        the spectrum is calculated exactly.
+
+        Parameters
+        ----------
+        waves : np.ndarray
+            Strictly increasing wavelengths in nm
+        """
+        waves = np.asarray(waves, dtype='float')
+        F0, F1 = self._antiderivatives(waves)
+        M0 = np.diff(F0)
+        # integral of T(x) * (x - x0) / h over each interval
+        upper = (np.diff(F1) - (waves[:-1] - self.center) * M0) / \
+            np.diff(waves)
+        weights = np.zeros_like(waves)
+        weights[:-1] += M0 - upper
+        weights[1:] += upper
+        return weights
+
+    def band_integral(self, waves, spectrum):
+        """Return `spectrum` integrated over the filter band.
+
+        Parameters
+        ----------
+        waves : np.ndarray
+            Strictly increasing wavelengths in nm
+        spectrum : np.ndarray or astropy.units.Quantity
+            Spectrum sampled at `waves`, the result is in its unit times nm.
+        """
+        return self.band_weights(waves) @ spectrum
+
 
 class ConstantFilter(Filter):
     def response(self, wave1, wave2):
@@ -36,3 +106,232 @@ class ConstantFilter(Filter):
         d['wavelength'] = waves
         d['response'] = response
         return d
+
+    def transmission_at(self, waves):
+        inside = np.abs(np.asarray(waves) - self.center) < self.width / 2
+        return np.where(inside, self.transmission, 0.0)
+
+    def _antiderivatives(self, waves):
+        x = np.clip(waves - self.center, -self.width / 2, self.width / 2)
+        F0 = self.transmission * (x + self.width / 2)
+        F1 = self.transmission * (x**2 - self.width**2 / 4) / 2
+        return F0, F1
+
+
+class GaussianFilter(Filter):
+    """Filter with a Gaussian profile.
+
+    Parameters
+    ----------
+    width : float
+        Full width at half maximum in nm
+
+    For the other parameters see `Filter`.
+    """
+
+    @property
+    def sigma(self):
+        return self.width / (2 * math.sqrt(2 * math.log(2)))
+
+    def transmission_at(self, waves):
+        z = (np.asarray(waves) - self.center) / self.sigma
+        return self.transmission * np.exp(-z**2 / 2)
+
+    def _antiderivatives(self, waves):
+        z = (np.asarray(waves) - self.center) / self.sigma
+        F0 = self.transmission * self.sigma * math.sqrt(math.tau) * ndtr(z)
+        F1 = -self.sigma**2 * self.transmission * np.exp(-z**2 / 2)
+        return F0, F1
+
+
+class TabulatedFilter(Filter):
+    """Filter with a measured, piecewise linear transmission profile.
+
+    The transmission is zero outside of the tabulated wavelengths, center and
+    width are derived as centroid and equivalent width of the profile.
+
+    Parameters
+    ----------
+    waves : array-like
+        Strictly increasing wavelengths in nm
+    transmissions : array-like
+        Transmission at `waves`
+    res : float
+        Resolution of the wavelength grid for `response` in nm
+    """
+
+    def __init__(self, waves, transmissions, res=1):
+        self.waves = np.asarray(waves, dtype='float')
+        self.transmissions = np.asarray(transmissions, dtype='float')
+        if np.any(np.diff(self.waves) <= 0):
+            raise ValueError("Wavelengths have to be strictly increasing.")
+        peak = self.transmissions.max()
+        weights = trapezoid_weights(self.waves)
+        area = weights @ self.transmissions
+        center = weights @ (self.waves * self.transmissions) / area
+        super().__init__(center, area / peak, peak, res=res)
+
+    def transmission_at(self, waves):
+        return np.interp(waves, self.waves, self.transmissions,
+                         left=0.0, right=0.0)
+
+    def _partial_integrals(self, k, dx):
+        "Return integrals from node `k` over a distance `dx`."
+        p = self.waves[k] - self.center
+        q = self.transmissions[k]
+        m = np.diff(self.transmissions)[k] / np.diff(self.waves)[k]
+        I0 = q * dx + m * dx**2 / 2
+        I1 = p * q * dx + (p * m + q) * dx**2 / 2 + m * dx**3 / 3
+        return I0, I1
+
+    def _antiderivatives(self, waves):
+        x = np.clip(waves, self.waves[0], self.waves[-1])
+        nodes = np.arange(self.waves.size - 1)
+        C0, C1 = self._partial_integrals(nodes, np.diff(self.waves))
+        C0 = np.concatenate([[0.0], np.cumsum(C0)])
+        C1 = np.concatenate([[0.0], np.cumsum(C1)])
+        k = np.clip(np.searchsorted(self.waves, x, side='right') - 1,
+                    0, self.waves.size - 2)
+        I0, I1 = self._partial_integrals(k, x - self.waves[k])
+        return C0[k] + I0, C1[k] + I1
+
+
+class TrapezoidFilter(TabulatedFilter):
+    """Filter with a flat top and linear edges.
+
+    Parameters
+    ----------
+    center : float
+        Center wavelength in nm
+    width : float
+        Full width at half maximum in nm
+    transmission : float
+        Transmission of the flat top
+    edge : float
+        Width of each edge from zero to full transmission in nm, at most
+        `width`.
+    res : float
+        Resolution of the wavelength grid for `response` in nm
+    """
+
+    def __init__(self, center, width, transmission, edge, res=1):
+        if not 0 < edge <= width:
+            raise ValueError("Edge width has to be in (0, width].")
+        half = width / 2
+        waves = [center - half - edge / 2, center - half + edge / 2,
+                 center + half - edge / 2, center + half + edge / 2]
+        if edge == width:
+            del waves[1]
+            transmissions = [0, transmission, 0]
+        else:
+            transmissions = [0, transmission, transmission, 0]
+        super().__init__(waves, transmissions, res=res)
+        self.edge = edge
+
+
+def trapezoid_weights(waves):
+    "Return weights that integrate samples on `waves` by the trapezoid rule."
+    waves = np.asarray(waves, dtype='float')
+    weights = np.zeros_like(waves)
+    steps = np.diff(waves) / 2
+    weights[:-1] += steps
+    weights[1:] += steps
+    return weights
+
+
+class FilterBank:
+    """Set of constant filters evaluated together on a shared grid.
+
+    Parameters
+    ----------
+    centers : array-like
+        Filter centers in nm
+    widths : array-like
+        Filter widths in nm
+    transmissions : array-like or float
+        Transmission inside of each filter's band
+    res : float
+        Resolution of the shared wavelength grid in nm
+    """
+
+    def __init__(self, centers, widths, transmissions=1.0, res=1):
+        self.centers = np.atleast_1d(np.asarray(centers, dtype='float'))
+        self.widths = np.broadcast_to(
+            np.asarray(widths, dtype='float'), self.centers.shape).copy()
+        self.transmissions = np.broadcast_to(
+            np.asarray(transmissions, dtype='float'),
+            self.centers.shape).copy()
+        self.resolution = res
+
+    @classmethod
+    def from_filters(cls, filters):
+        "Create FilterBank from a list of `ConstantFilter` objects."
+        return cls([f.center for f in filters],
+                   [f.width for f in filters],
+                   [f.transmission for f in filters],
+                   res=filters[0].resolution)
+
+    def __len__(self):
+        return self.centers.size
+
+    def wavelengths(self, wave1, wave2):
+        "Return the shared wavelength grid from `wave1` to `wave2`."
+        return np.arange(wave1.value,
+                         wave2.value+self.resolution,
+                         self.resolution, dtype='float')
+
+    def response_matrix(self, waves):
+        """Return filter responses at `waves`.
+
+        Parameters
+        ----------
+        waves : np.ndarray
+            Wavelengths in nm
+
+        Returns
+        -------
+        np.ndarray
+            Array of shape (n_filters, n_waves)
+        """
+        leftside = (self.centers - self.widths / 2)[:, np.newaxis]
+        rightside = (self.centers + self.widths / 2)[:, np.newaxis]
+        inside = (waves > leftside) & (waves < rightside)
+        return np.where(inside, self.transmissions[:, np.newaxis], 0.0)
+
+    def band_weights(self, waves):
+        """Return `Filter.band_weights` of each filter.
+
+        Returns
+        -------
+        np.ndarray
+            Array of shape (n_filters, n_waves)
+        """
+        return np.array([ConstantFilter(*args).band_weights(waves) for args
+                         in zip(self.centers, self.widths,
+                                self.transmissions)])
+
+    def response(self, wave1, wave2):
+        "Return dict like `ConstantFilter.response` with a response matrix."
+        waves = self.wavelengths(wave1, wave2)
+        d = {}
+        d['wavelength'] = waves
+        d['response'] = self.response_matrix(waves)
+        return d
+
+    def throughput(self, waves, spectrum):
+        """Return `spectrum` integrated over each filter band.
+
+        Parameters
+        ----------
+        waves : np.ndarray
+            Wavelengths in nm
+        spectrum : np.ndarray or astropy.units.Quantity
+            Spectrum sampled at `waves`, results are in its unit times nm.
+
+        Returns
+        -------
+        np.ndarray
+            Band integrals, one per filter
+        """
+        weights = trapezoid_weights(waves)
+        return self.response_matrix(waves) @ (spectrum * weights)
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+"""Simulated raw detector frames for testing ground processing."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from astropy import units as u
+from numpy.lib.format import open_memmap
+
+from .exposure import NoiseModel
+
+
+class FrameSimulator:
+    """Raw frames with shot, dark current, read and quantization noise.
+
+    Frames have `detector.x` lines and `detector.y` samples and are written
+    tile by tile, so stacks larger than memory can be generated into
+    memory-mapped .npy files. Tiles are generated in a thread pool, each
+    with its own random generator derived from `seed`, frame and tile, so
+    results don't depend on the scheduling.
+
+    Parameters
+    ----------
+    detector : detectors.Detector
+        Provides format, bits, gain and, unless `noise` is given, noise.
+    rates : float, array-like or astropy.units.Quantity
+        Signal rate in electrons/s per pixel for each frame, e.g. the values
+        of `Radiometry.band_signal_rates` for one frame per band.
+    exp : float
+        Exposure time in seconds
+    scene : array-like, optional
+        Relative signal of shape (x, y) multiplying the rates, uniform if not
+        given. May be a memory-mapped array, only tiles of it are read.
+    noise : exposure.NoiseModel, optional
+        Noise model, default is `NoiseModel.from_detector(detector)`.
+    seed : int, optional
+        Seed for reproducible frames.
+    tile : tuple of int
+        Lines and samples per tile
+    """
+
+    def __init__(self, detector, rates, exp=0.01, scene=None, noise=None,
+                 seed=None, tile=(512, 512)):
+        self.detector = detector
+        if isinstance(rates, u.Quantity):
+            rates = rates.value
+        self.rates = np.atleast_1d(np.asarray(rates, dtype='float'))
+        self.exp = exp
+        self.scene = scene
+        if noise is None:
+            noise = NoiseModel.from_detector(detector)
+        self.noise = noise
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+        self.seed = seed
+        self.tile = tile
+
+    @property
+    def shape(self):
+        return (self.rates.size, self.detector.x, self.detector.y)
+
+    @property
+    def bits(self):
+        return int(self.detector.dynamic_range.to_value(u.bit))
+
+    @property
+    def dtype(self):
+        "Return the smallest unsigned integer type holding all DNs."
+        return np.min_scalar_type(2**self.bits - 1)
+
+    def tiles(self):
+        "Return list of (frame, line slice, sample slice) of all tiles."
+        n_frames, n_lines, n_samples = self.shape
+        lines, samples = self.tile
+        return [(frame, slice(i, min(i + lines, n_lines)),
+                 slice(j, min(j + samples, n_samples)))
+                for frame in range(n_frames)
+                for i in range(0, n_lines, lines)
+                for j in range(0, n_samples, samples)]
+
+    def simulate_tile(self, frame, lines, samples):
+        "Return DNs of one tile of `frame`."
+        rng = np.random.default_rng(
+            [self.seed, frame, lines.start, samples.start])
+        shape = (lines.stop - lines.start, samples.stop - samples.start)
+        signal = self.rates[frame]
+        if self.scene is not None:
+            signal = signal * np.asarray(self.scene[lines, samples],
+                                         dtype='float')
+        mean = (signal + self.noise.dark_current) * self.exp
+        electrons = rng.poisson(np.broadcast_to(mean, shape)).astype('float')
+        if self.noise.read_noise:
+            electrons += rng.normal(0.0, self.noise.read_noise, shape)
+        electrons = np.minimum(electrons, self.noise.saturation)
+        dn = np.rint(electrons / self.detector.gain, out=electrons)
+        np.clip(dn, 0, 2**self.bits - 1, out=dn)
+        return dn.astype(self.dtype)
+
+    def run(self, path=None, jobs=None):
+        """Generate all frames.
+
+        Parameters
+        ----------
+        path : str or pathlib.Path, optional
+            .npy file to write the stack to as memory-mapped array. If not
+            given, the stack is kept in memory.
+        jobs : int, optional
+            Number of threads, default is chosen by `ThreadPoolExecutor`.
+
+        Returns
+        -------
+        np.ndarray
+            Stack of shape (n_frames, x, y), a `np.memmap` if `path` is
+            given.
+        """
+        if path is None:
+            out = np.empty(self.shape, dtype=self.dtype)
+        else:
+            out = open_memmap(path, mode='w+', dtype=self.dtype,
+                              shape=self.shape)
+
+        def work(tile):
+            frame, lines, samples = tile
+            out[frame, lines, samples] = self.simulate_tile(*tile)
+
+        with ThreadPoolExecutor(jobs) as executor:
+            for _ in executor.map(work, self.tiles()):
+                pass
+        if path is not None:
+            out.flush()
+        return out
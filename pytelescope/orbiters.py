@@ -3,15 +3,131 @@
 """Orbiter module to put telescope on."""
 
 import math
+import os
+import warnings
 
 import numpy as np
-import spiceypy as spice
 from astropy import constants as const
 from astropy import units as u
 
-from spicer.kernels import load_generic_kernels
+from .utils import memoized
 
-load_generic_kernels()
+# GM [km**3/s**2] and RADII [km] from the NAIF generic kernels gm_de431.tpc
+# and pck00010.tpc, used when SPICE is disabled or kernels can't be loaded.
+BODY_CONSTANTS = {
+    'SUN': (1.3271244004193938e+11, (696000.0, 696000.0, 696000.0)),
+    'MERCURY': (2.2031780000000021e+04, (2439.7, 2439.7, 2439.7)),
+    'VENUS': (3.2485859200000006e+05, (6051.8, 6051.8, 6051.8)),
+    'EARTH': (3.9860043543609598e+05, (6378.1366, 6378.1366, 6356.7519)),
+    'MOON': (4.9028000661637961e+03, (1737.4, 1737.4, 1737.4)),
+    'MARS': (4.282837362069909e+04, (3396.19, 3396.19, 3376.20)),
+    'JUPITER': (1.266865349218008e+08, (71492.0, 71492.0, 66854.0)),
+    'SATURN': (3.793120749865224e+07, (60268.0, 60268.0, 54364.0)),
+    'URANUS': (5.793951322279009e+06, (25559.0, 25559.0, 24973.0)),
+    'NEPTUNE': (6.835099502439672e+06, (24764.0, 24764.0, 24341.0)),
+}
+
+# Set to False (or set PYTELESCOPE_NO_SPICE in the environment) to never
+# touch the SPICE kernel pool and only use BODY_CONSTANTS.
+use_spice = not os.environ.get('PYTELESCOPE_NO_SPICE')
+
+_kernels_loaded = False
+# Error of a failed kernel load, bodies in BODY_CONSTANTS use the bundled
+# values afterwards instead of trying to load (e.g. download) again.
+_kernel_error = None
+_body_constants = {}
+
+
+def _load_generic_kernels():
+    from spicer.kernels import load_generic_kernels
+    load_generic_kernels()
+
+
+def load_kernels():
+    """Load the SPICE generic kernels, once per process.
+
+    After a failed load, later calls raise a RuntimeError without trying
+    again until `clear_body_constants` is called.
+    """
+    global _kernels_loaded, _kernel_error
+    if _kernel_error is not None:
+        raise RuntimeError("Loading the SPICE kernels failed before."
+                           ) from _kernel_error
+    if not _kernels_loaded:
+        try:
+            _load_generic_kernels()
+        except Exception as e:
+            _kernel_error = e
+            raise
+        _kernels_loaded = True
+
+
+def _spice_constants(body):
+    import spiceypy as spice
+
+    load_kernels()
+    GM = spice.bodvrd(body, "GM", 1)[1][0]
+    radius = spice.bodvrd(body, "RADII", 3)[1].mean()
+    return GM, radius
+
+
+def _bundled_constants(key):
+    GM, radii = BODY_CONSTANTS[key]
+    return GM, np.mean(radii)
+
+
+def body_constants(body):
+    """Return GM and mean radius of `body`.
+
+    Values are read from SPICE, loading the generic kernels on first use.
+    If `use_spice` is False, or SPICE fails for a body listed in
+    `BODY_CONSTANTS`, the bundled values are used instead. After the
+    kernels failed to load, they are used for all listed bodies without a
+    further warning.
+    Values are cached per process and body name, call
+    `clear_body_constants` after loading other kernels.
+
+    Returns
+    -------
+    tuple of float
+        GM in km**3/s**2 and mean radius in km.
+    """
+    key = body.upper()
+    try:
+        return _body_constants[key]
+    except KeyError:
+        pass
+    if not use_spice or (_kernel_error is not None and
+                         key in BODY_CONSTANTS):
+        constants = _bundled_constants(key)
+    else:
+        try:
+            constants = _spice_constants(body)
+        except Exception as e:
+            if key not in BODY_CONSTANTS:
+                raise
+            warnings.warn(f"SPICE lookup for {body} failed ({e!r}), "
+                          "using bundled constants.")
+            constants = _bundled_constants(key)
+    _body_constants[key] = constants
+    return constants
+
+
+def clear_body_constants():
+    "Invalidate the cached SPICE body constants and a failed kernel load."
+    global _kernel_error
+    _kernel_error = None
+    _body_constants.clear()
+
+
+def body_GM(body):
+    "Return GM of `body` in km**3/s**2."
+    return body_constants(body)[0]
+
+
+def body_radius(body):
+    "Return mean radius of `body` in km."
+    return body_constants(body)[1]
 
 
 class Orbiter:
@@ -27,63 +143,350 @@ class Orbiter:
     GM : Product of G and M of body
         Rread from SPICE
     GM_unit : astropy.unit
+
+    Notes
+    -----
+    Derived quantities are memoized and recalculated only after `body` or
+    `alt` are reassigned. Modifying an `alt` array in place is not
+    detected.
+
+    With `fast` set to True (on the class or an instance), `v`, `T`,
+    `v_surf`, `ground_travel` and `slew_rate` are calculated on plain
+    float64 arrays in SI units, attaching units only to the results.
     """
     GM_unit = (u.km) ** 3 / (u.s) ** 2
+    fast = False
 
     def __init__(self, body, alt):
+        self._cache = {}
         self.body = body
         self.alt = alt
 
     @property
-    def GM(self):
-        return spice.bodvrd(self.body, "GM", 1)[1][0] * self.GM_unit
+    def body(self):
+        return self._body
+
+    @body.setter
+    def body(self, value):
+        self._body = value
+        self._cache.clear()
 
     @property
+    def alt(self):
+        return self._alt
+
+    @alt.setter
+    def alt(self, value):
+        self._alt = value
+        self._cache.clear()
+
+    @memoized
+    def GM(self):
+        return body_GM(self.body) * self.GM_unit
+
+    @memoized
     def R_body(self):
         "Using mean radius here!"
-        radii = spice.bodvrd(self.body, "RADII", 3)[1]
-        return radii.mean()*u.km
+        return body_radius(self.body) * u.km
 
-    @property
+    @memoized
     def R(self):
         return self.R_body + self.alt
 
-    @property
+    @memoized
+    def _si(self):
+        "Return orbit quantities as float64 arrays in SI units."
+        d = {}
+        GM = self.GM.to_value(u.m**3 / u.s**2)
+        R_body = self.R_body.to_value(u.m)
+        alt = self.alt.to_value(u.m)
+        R = R_body + alt
+        d['v'] = np.sqrt(GM / R)
+        d['T'] = math.tau * R / d['v']
+        d['v_surf'] = math.tau * R_body / d['T']
+        d['slew_rate'] = np.degrees(np.arctan(d['v_surf'] / alt))
+        return d
+
+    @memoized
     def v(self):
         "Return orbital velocity."
+        if self.fast:
+            return self._si['v'] << (u.m / u.s)
         return np.sqrt(self.GM / self.R).decompose()
 
-    @property
+    @memoized
     def surface_circumference(self):
         "Calculate circumference of circular central body."
         return math.tau * self.R_body
 
-    @property
+    @memoized
     def orbitpath(self):
         "Return circumference of circular orbit around central body."
         return math.tau * self.R
 
-    @property
+    @memoized
     def T(self):
         "Return orbital period time T."
+        if self.fast:
+            return self._si['T'] << u.s
         return (self.orbitpath / self.v).decompose()
 
-    @property
+    @memoized
     def v_surf(self):
         "Return surface footprint speed."
+        if self.fast:
+            return self._si['v_surf'] << (u.m / u.s)
         return (self.surface_circumference / self.T).decompose()
 
     def ground_travel(self, t):
         "Return footprint travel distance in time `t`."
+        if self.fast:
+            return (self._si['v_surf'] * t.to_value(u.s)) << u.m
         return (self.v_surf * t).decompose()
 
-    @property
+    @memoized
     def slew_rate(self):
         "Return calculated slew rate in degrees/second for targeting one ground spot."
+        if self.fast:
+            return self._si['slew_rate'] << (u.degree / u.s)
         gt = self.ground_travel(1 * u.s)
         return np.arctan(gt / self.alt).to(u.degree) / u.s
 
 
+class OrbiterGrid(Orbiter):
+    """Orbiter evaluated for several bodies and altitudes at once.
+
+    All derived quantities of `Orbiter` are broadcast over a
+    (n_bodies, n_alts) grid, so that altitude trade studies don't need one
+    Orbiter instance per value.
+
+    Parameters
+    ----------
+    bodies : str or list of str
+        SPICE Body name(s) (like earth, mars etc.)
+    alt : astropy.unit.length[km, m, etc]
+        1D array of orbital heights above ground (=altitudes).
+    """
+
+    def __init__(self, bodies, alt):
+        if isinstance(bodies, str):
+            bodies = [bodies]
+        if not isinstance(alt, u.quantity.Quantity):
+            print("Assuming kilometers as unit for input parameter.")
+            alt = alt * u.km
+        super().__init__(list(bodies), np.atleast_1d(alt)[np.newaxis, :])
+
+    @property
+    def bodies(self):
+        return self.body
+
+    @property
+    def shape(self):
+        return (len(self.bodies), self.alt.shape[1])
+
+    @memoized
+    def GM(self):
+        values = [body_GM(body) for body in self.bodies]
+        return np.array(values)[:, np.newaxis] * self.GM_unit
+
+    @memoized
+    def R_body(self):
+        "Using mean radius here!"
+        values = [body_radius(body) for body in self.bodies]
+        return np.array(values)[:, np.newaxis] * u.km
+
+    def table(self):
+        """Return flattened columns of the grid, one row per body/altitude.
+
+        Returns
+        -------
+        dict
+            Keys are 'body', 'alt', 'v', 'T', 'v_surf' and 'slew_rate'.
+        """
+        d = {}
+        d['body'] = np.repeat(self.bodies, self.shape[1])
+        for key in ['alt', 'v', 'T', 'v_surf', 'slew_rate']:
+            value = getattr(self, key)
+            column = np.broadcast_to(value.value, self.shape).ravel()
+            d[key] = column * value.unit
+        return d
+
+
+def solve_kepler(M, e, tol=1e-12, maxiter=50):
+    """Solve Kepler's equation M = E - e sin(E) for the eccentric anomaly.
+
+    Newton iterations run on the whole array at once until all values are
+    converged.
+
+    Parameters
+    ----------
+    M : array-like
+        Mean anomalies in radians
+    e : float
+        Eccentricity, 0 <= e < 1
+    tol : float
+        Convergence limit for the change of E in radians
+    maxiter : int
+        Maximum number of iterations
+
+    Returns
+    -------
+    np.ndarray
+        Eccentric anomalies in radians, in [0, 2 pi).
+    """
+    M = np.asarray(M, dtype='float')
+    shape = M.shape
+    M = np.mod(M.ravel(), math.tau)
+    E = M + e * np.sin(M) if e < 0.8 else np.full_like(M, math.pi)
+    step = np.empty_like(E)
+    for _ in range(maxiter):
+        # step = (E - e sin(E) - M) / (1 - e cos(E)), using few temporaries
+        np.sin(E, out=step)
+        step *= -e
+        step += E
+        step -= M
+        step /= 1 - e * np.cos(E)
+        E -= step
+        if np.max(np.abs(step), initial=0.0) < tol:
+            return E.reshape(shape)
+    raise RuntimeError(f"Kepler solver did not converge in {maxiter} "
+                       "iterations.")
+
+
+class EllipticalOrbiter:
+    """Orbiter on an elliptical orbit, evaluated at arbitrary epochs.
+
+    Parameters
+    ----------
+    body : str
+        SPICE Body name (like earth, mars etc.)
+    peri_alt, apo_alt : astropy.unit.length
+        Altitudes of periapsis and apoapsis above the mean radius.
+
+    Notes
+    -----
+    `state` returns time series for whole arrays of epochs. Ground speed is
+    the speed of the sub-spacecraft point on a non-rotating body, and slew
+    rate is defined like for `Orbiter`, so both reduce to the `Orbiter`
+    values for circular orbits. Like for `Orbiter`, derived quantities are
+    memoized until `body`, `peri_alt` or `apo_alt` are reassigned.
+    """
+    GM_unit = Orbiter.GM_unit
+
+    def __init__(self, body, peri_alt, apo_alt):
+        if apo_alt < peri_alt:
+            raise ValueError("Apoapsis altitude is below periapsis altitude.")
+        self._cache = {}
+        self.body = body
+        self.peri_alt = peri_alt
+        self.apo_alt = apo_alt
+
+    @property
+    def body(self):
+        return self._body
+
+    @body.setter
+    def body(self, value):
+        self._body = value
+        self._cache.clear()
+
+    @property
+    def peri_alt(self):
+        return self._peri_alt
+
+    @peri_alt.setter
+    def peri_alt(self, value):
+        self._peri_alt = value
+        self._cache.clear()
+
+    @property
+    def apo_alt(self):
+        return self._apo_alt
+
+    @apo_alt.setter
+    def apo_alt(self, value):
+        self._apo_alt = value
+        self._cache.clear()
+
+    @memoized
+    def GM(self):
+        return body_GM(self.body) * self.GM_unit
+
+    @memoized
+    def R_body(self):
+        "Using mean radius here!"
+        return body_radius(self.body) * u.km
+
+    @memoized
+    def _si(self):
+        "Return orbit elements as floats in SI units."
+        d = {}
+        d['GM'] = self.GM.to_value(u.m**3 / u.s**2)
+        d['R_body'] = self.R_body.to_value(u.m)
+        r_peri = d['R_body'] + self.peri_alt.to_value(u.m)
+        r_apo = d['R_body'] + self.apo_alt.to_value(u.m)
+        d['a'] = (r_peri + r_apo) / 2
+        d['e'] = (r_apo - r_peri) / (r_apo + r_peri)
+        d['n'] = math.sqrt(d['GM'] / d['a']**3)
+        d['h'] = math.sqrt(d['GM'] * d['a'] * (1 - d['e']**2))
+        return d
+
+    @property
+    def a(self):
+        "Return semi-major axis."
+        return (self._si['a'] << u.m).to(u.km)
+
+    @property
+    def e(self):
+        "Return eccentricity."
+        return self._si['e']
+
+    @property
+    def T(self):
+        "Return orbital period time T."
+        return (math.tau / self._si['n']) << u.s
+
+    def state(self, t):
+        """Return orbit state at epochs `t` after periapsis passage.
+
+        Parameters
+        ----------
+        t : astropy.unit.time
+            Epoch or array of epochs, of any length.
+
+        Returns
+        -------
+        dict
+            Arrays of the shape of `t` for 'true_anomaly', 'r', 'alt', 'v',
+            'v_surf' and 'slew_rate'.
+        """
+        si = self._si
+        e = si['e']
+        t = np.asarray(t.to_value(u.s), dtype='float')
+        shape = t.shape
+        E = solve_kepler(si['n'] * t.ravel(), e)
+        half = E / 2
+        nu = 2 * np.arctan2(math.sqrt(1 + e) * np.sin(half),
+                            math.sqrt(1 - e) * np.cos(half))
+        del half
+        r = np.cos(E, out=E)
+        r *= -e
+        r += 1
+        r *= si['a']
+        alt = r - si['R_body']
+        v = np.sqrt(si['GM'] * (2 / r - 1 / si['a']))
+        # angular rate of the radius vector is h / r**2
+        v_surf = si['h'] * si['R_body'] / r**2
+        d = {}
+        d['true_anomaly'] = np.degrees(nu, out=nu) << u.deg
+        d['r'] = r << u.m
+        d['alt'] = alt << u.m
+        d['v'] = v << (u.m / u.s)
+        d['v_surf'] = v_surf << (u.m / u.s)
+        d['slew_rate'] = np.degrees(np.arctan(v_surf / alt)) << (u.deg / u.s)
+        return {key: value.reshape(shape) for key, value in d.items()}
+
+
 class MarsOrbiter(Orbiter):
     """Specialized Orbiter class for Mars.
 
@@ -1,4 +1,7 @@
+import functools
 import math
+import os
+from pathlib import Path
 
 import astropy.units as u
 import numpy as np
@@ -6,9 +9,10 @@ import pandas as pd
 from astropy.constants import c, h
 from scipy.interpolate import InterpolatedUnivariateSpline
 
-from planetpy.constants import earth, mars
-from pyspectral.solar import (TOTAL_IRRADIANCE_SPECTRUM_2000ASTM,
-                              SolarIrradianceSpectrum)
+from . import datasets
+from .cache import ResultCache, hash_inputs
+from .detectors import QECurve
+from .utils import memoized, outer_grid
 
 dic = {
     'A_t': 5e-3 * u.m*u.m,
@@ -20,43 +24,204 @@ dic = {
 }
 
 
+# Directory to persist interpolated solar spectra in, None to only keep
+# them in memory.
+irradiance_cache_dir = os.environ.get('PYTELESCOPE_CACHE_DIR')
+
+
+def _interpolate_irradiance(wave1, wave2, dlambda):
+    from pyspectral.solar import (TOTAL_IRRADIANCE_SPECTRUM_2000ASTM,
+                                  SolarIrradianceSpectrum)
+
+    sol = SolarIrradianceSpectrum(TOTAL_IRRADIANCE_SPECTRUM_2000ASTM)
+    sol.interpolate(dlambda=dlambda, ival_wavelength=(wave1, wave2))
+    return np.vstack([sol.ipol_wavelength, sol.ipol_irradiance])
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_irradiance(wave1, wave2, dlambda):
+    if irradiance_cache_dir is None:
+        data = _interpolate_irradiance(wave1, wave2, dlambda)
+    else:
+        fname = Path(irradiance_cache_dir) / \
+            f"e490_{wave1!r}_{wave2!r}_{dlambda!r}.npy"
+        if not fname.exists():
+            fname.parent.mkdir(parents=True, exist_ok=True)
+            data = _interpolate_irradiance(wave1, wave2, dlambda)
+            tmpname = fname.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmpname, 'wb') as f:
+                np.save(f, data)
+            os.replace(tmpname, fname)
+        data = np.load(fname, mmap_mode='r')
+    data.setflags(write=False)
+    return data
+
+
+def solar_irradiance(wave1=200*u.nm, wave2=1200*u.nm, dlambda=1*u.nm):
+    """Return the ASTM E490 solar spectrum interpolated to a wavelength grid.
+
+    Results are kept in an LRU cache keyed by (wave1, wave2, dlambda) and,
+    if `irradiance_cache_dir` is set, persisted there as memory-mapped .npy
+    files to be shared between processes.
+
+    Parameters
+    ----------
+    wave1, wave2 : astropy.unit.length
+        Wavelength range
+    dlambda : astropy.unit.length
+        Wavelength step
+
+    Returns
+    -------
+    waves, irradiance : np.ndarray
+        Read-only arrays of wavelengths in micron and spectral irradiance in
+        W/m2/micron (pyspectral units).
+    """
+    data = _cached_irradiance(wave1.to(u.micron).value,
+                              wave2.to(u.micron).value,
+                              dlambda.to(u.micron).value)
+    return data[0], data[1]
+
+
+def clear_irradiance_cache():
+    "Clear the in-memory cache of interpolated solar spectra."
+    _cached_irradiance.cache_clear()
+
+
+def interpolate(x, xp, fp, k=1):
+    """Interpolate data (xp, fp) to `x`, extrapolating beyond its ends.
+
+    Equivalent to scipy's `InterpolatedUnivariateSpline` of order `k`, but
+    uses `np.interp` for the linear case to avoid building a spline.
+    """
+    xp = np.asarray(xp, dtype=float)
+    fp = np.asarray(fp, dtype=float)
+    if k != 1:
+        return InterpolatedUnivariateSpline(xp, fp, k=k)(x)
+    y = np.interp(x, xp, fp)
+    left = x < xp[0]
+    right = x > xp[-1]
+    y[left] = fp[0] + (x[left] - xp[0]) * \
+        (fp[1] - fp[0]) / (xp[1] - xp[0])
+    y[right] = fp[-1] + (x[right] - xp[-1]) * \
+        (fp[-1] - fp[-2]) / (xp[-1] - xp[-2])
+    return y
+
+
+class SolarIrradiance:
+    def __init__(self, wave1=200 * u.nm, wave2=1200 * u.nm, dlambda=1 * u.nm):
+        self.wave1 = wave1
+        self.wave2 = wave2
+        self.dlambda = dlambda
+        waves, irradiance = solar_irradiance(wave1, wave2, dlambda)
+        self.waves = waves * u.micron  # b/c pyspectral works in micron
+        self.E_w = irradiance * Radiometry.E_w_unit_in
+
+
 class Response:
+    pass
 
 
 class Radiometry:
+    """Signal calculation for a telescope observing a sunlit surface.
+
+    Parameters
+    ----------
+    wave1, wave2 : astropy.unit.length
+        Wavelength range
+    dlambda : astropy.unit.length
+        Wavelength step
+    i : astropy.unit.angle
+        Incidence angle
+    d : float
+        Solar distance in AU
+    detector : detectors.Detector, optional
+        Detector whose QE curve is used instead of reading `QE_data`.
+
+    Interpolated spectral properties are memoized and recalculated only
+    after `waves`, `E_w`, `reflectance` or `QE` are reassigned.
+
+    With `fast` set to True (on the class or an instance), `E_ph`, `L_surf`,
+    `CR` and `signal_rate` are calculated on plain float64 arrays, attaching
+    units only to the results.
+
+    `results` looks up `E_ph`, `L_surf` and `CR` in `result_cache` (a
+    `cache.ResultCache`), keyed by a hash of all inputs.
+    """
     E_w_unit_in = u.Watt/u.m/u.m/u.micron
     E_w_unit_out = u.Watt/u.m/u.m/u.nm
     E_ph_unit = 1/(u.s*u.m*u.m*u.nm)
     lw = 0.75
-    rootpath = Path("/Users/klay6683/Documents/proposals/2018/MAPSE/")
+    reflectance_data = 'giza_crism_blue_halos'
+    QE_data = 'midband_coated_QE'
+    spline_order = 1
+    fast = False
+    result_cache = None
 
     def __init__(self, wave1=200*u.nm, wave2=1200*u.nm, dlambda=1*u.nm,
-                 i=75*u.deg, d=1.5):
+                 i=75*u.deg, d=1.5, detector=None):
+        self._cache = {}
         self.wave1 = wave1
         self.wave2 = wave2
         self.dlambda = dlambda
         self.i = i  # incidence angle
         self.d = d  # Mars distance in AU (scaling the solar flux)
-        sol = SolarIrradianceSpectrum(TOTAL_IRRADIANCE_SPECTRUM_2000ASTM)
-        sol.interpolate(dlambda=dlambda.to(u.micron).value,
-                        ival_wavelength=(wave1.to(u.micron).value,
-                                         wave2.to(u.micron).value))
-        self.waves = (sol.ipol_wavelength*u.micron).to(u.nm)
-        self.E_w = (sol.ipol_irradiance*self.E_w_unit_in).to(self.E_w_unit_out)
+        waves, irradiance = solar_irradiance(wave1, wave2, dlambda)
+        self.waves = (waves*u.micron).to(u.nm)
+        self.E_w = (irradiance*self.E_w_unit_in).to(self.E_w_unit_out)
 
         self.read_reflectance()
-        self.read_QE()
+        if detector is not None and detector.qe is not None:
+            self.QE = detector.qe
+        else:
+            self.read_QE()
         for k, v in dic.items():
             setattr(self, k, v)
 
+    @property
+    def waves(self):
+        return self._waves
+
+    @waves.setter
+    def waves(self, value):
+        self._waves = value
+        self._cache.clear()
+
+    @property
+    def E_w(self):
+        return self._E_w
+
+    @E_w.setter
+    def E_w(self, value):
+        self._E_w = value
+        self._cache.clear()
+
+    @property
+    def reflectance(self):
+        return self._reflectance
+
+    @reflectance.setter
+    def reflectance(self, value):
+        self._reflectance = value
+        self._cache.clear()
+
+    @property
+    def QE(self):
+        return self._QE
+
+    @QE.setter
+    def QE(self, value):
+        self._QE = value
+        self._cache.clear()
+
     def read_reflectance(self):
-        df = pd.read_csv(self.rootpath / 'giza_crism_blue_halos.csv')
+        df = datasets.load(self.reflectance_data)
         df = df.sort_values(by='Wavelength[nm]')
         pre_data = pd.DataFrame([[200, 0.02]], columns=df.columns)
         self.reflectance = pd.concat([pre_data, df])
 
     def read_QE(self):
-        df = pd.read_csv(self.rootpath / 'midband_coated_QE.csv')
+        df = datasets.load(self.QE_data)
         df = df.sort_values(by='Wavelength[nm]')
         pre_data = pd.DataFrame([[225, 0.0]], columns=df.columns)
         post_data = pd.DataFrame([[1100, 0.0]], columns=df.columns)
@@ -65,6 +230,10 @@ class Radiometry:
     @property
     def QE_rsr(self):
         d = {}
+        if isinstance(self.QE, QECurve):
+            d['wavelength'] = self.QE.waves
+            d['response'] = self.QE.qe
+            return d
         d['wavelength'] = self.QE.iloc[:, 0]
         d['response'] = self.QE.iloc[:, 1]/100.0
         return d
@@ -76,17 +245,16 @@ class Radiometry:
         d['response'] = self.reflectance.iloc[:, 1]
         return d
 
-    @property
+    @memoized
     def refl_ipol(self):
-        ius = InterpolatedUnivariateSpline(self.rsr['wavelength'],
-                                           self.rsr['response'],
-                                           k=1)
-        return ius(self.waves.value)
+        return interpolate(self.waves.value, self.rsr['wavelength'],
+                           self.rsr['response'], k=self.spline_order)
 
     def plot_E_w(self, ax=None):
         xlim = [self.wave1.value, self.wave2.value]
 
         if ax is None:
+            from matplotlib import pyplot as plt
             _, ax = plt.subplots(figsize=(8, 4))
 
         ax.plot(self.waves, self.E_w, lw=self.lw)
@@ -101,14 +269,24 @@ class Radiometry:
     def ph_per_energy(self):
         return self.waves/(h*c)
 
-    @property
+    @memoized
+    def _E_ph_si(self):
+        "Return `E_ph` as float64 array in `E_ph_unit`."
+        waves = self.waves.to_value(u.m)
+        E_w = self.E_w.to_value(self.E_w_unit_out)
+        return E_w * waves / (h.si.value * c.si.value)
+
+    @memoized
     def E_ph(self):
+        if self.fast:
+            return self._E_ph_si << self.E_ph_unit
         return (self.E_w * self.ph_per_energy).to(self.E_ph_unit)
 
     def plot_E_ph(self, ax=None):
         xlim = [self.wave1.value, self.wave2.value]
 
         if ax is None:
+            from matplotlib import pyplot as plt
             _, ax = plt.subplots(figsize=(8, 4))
 
         ax.plot(self.waves, self.E_ph, lw=self.lw)
@@ -121,20 +299,28 @@ class Radiometry:
 
     @property
     def resp_ipol(self):
-        ius = InterpolatedUnivariateSpline(self.rsr['wavelength'],
-                                           self.rsr['response'],
-                                           k=1)
-        return ius(self.waves.value)
+        return self.refl_ipol
 
-    @property
+    @memoized
     def QE_ipol(self):
-        ius = InterpolatedUnivariateSpline(self.QE_rsr['wavelength'],
-                                           self.QE_rsr['response'],
-                                           k=1)
-        return ius(self.waves.value)
+        if isinstance(self.QE, QECurve):
+            return self.QE.resample(self.waves.value)
+        return interpolate(self.waves.value, self.QE_rsr['wavelength'],
+                           self.QE_rsr['response'], k=self.spline_order)
+
+    def _L_surf_si(self):
+        geometry = math.cos(self.i.to_value(u.rad)) / math.pi / self.d**2
+        return self._E_ph_si * geometry * self.resp_ipol
+
+    def _CR_si(self):
+        optics = self.A_t.to_value(u.m**2) * self.A_p.to_value(u.m**2) * \
+            self.T_M1 * self.T_M2 * self.T_s / self.f.to_value(u.m)**2
+        return self._L_surf_si() * optics * self.QE_ipol
 
     @property
     def L_surf(self):
+        if self.fast:
+            return self._L_surf_si() << self.E_ph_unit
         term1 = self.E_ph/self.d**2
         term2 = math.cos(self.i.to(u.rad).value) / math.pi
         term3 = self.resp_ipol
@@ -142,13 +328,188 @@ class Radiometry:
 
     @property
     def CR(self):
+        if self.fast:
+            return self._CR_si() << (self.E_ph_unit * u.m * u.m)
         term1 = self.L_surf * self.A_t * self.A_p
         term2 = self.T_M1 * self.T_M2 * self.T_s * self.QE_ipol
         return term1*term2/(self.f**2)
 
     @property
     def signal_rate(self):
+        if self.fast:
+            return u.Quantity(self._CR_si().sum(), self.E_ph_unit * u.m * u.m)
         return self.CR.sum()
 
     def SNR(self, exp=0.01):
-        return math.sqrt(self.signal_rate.value * exp)
+        return np.sqrt(self.signal_rate.value * exp)
+
+    @memoized
+    def spectral_rate(self):
+        "Sum of photon irradiance, reflectance and QE over the wavelengths."
+        return (self.E_ph * self.resp_ipol * self.QE_ipol).sum()
+
+    @property
+    def cache_key(self):
+        """Hash of the spectral inputs, optics, incidence angle and distance.
+
+        The QE enters with its type, as QE curves and QE tables with equal
+        samples are interpolated differently.
+        """
+        # the QE type decides the interpolation, a QECurve is zero outside
+        # of its samples, tables are extrapolated by `spline_order` splines
+        if isinstance(self.QE, QECurve):
+            QE = ['QECurve', self.QE.waves, self.QE.qe]
+        else:
+            QE = ['spline'] + list(self.QE_rsr.values())
+        optics = {key: getattr(self, key) for key in dic}
+        return hash_inputs(self.waves, self.E_w, list(self.rsr.values()), QE,
+                           self.spline_order, optics, self.i, self.d)
+
+    def results(self, cache=None):
+        """Return `E_ph`, `L_surf` and `CR`, reusing cached arrays.
+
+        Parameters
+        ----------
+        cache : cache.ResultCache, optional
+            Cache to use instead of `result_cache`. Without either, a cache
+            in `irradiance_cache_dir` is used if that is set, otherwise the
+            results are only calculated.
+
+        Returns
+        -------
+        dict
+            Quantities on read-only, memory-mapped arrays for cache hits.
+        """
+        if cache is None:
+            cache = self.result_cache
+        if cache is None and irradiance_cache_dir is not None:
+            cache = ResultCache(Path(irradiance_cache_dir) / 'radiometry')
+        arrays = None
+        if cache is not None:
+            key = self.cache_key
+            arrays = cache.get(key)
+        if arrays is None:
+            arrays = {}
+            arrays['E_ph'] = self._E_ph_si
+            arrays['L_surf'] = self._L_surf_si()
+            arrays['CR'] = self._CR_si()
+            if cache is not None:
+                arrays = cache.put(key, arrays)
+        units = dict(E_ph=self.E_ph_unit, L_surf=self.E_ph_unit,
+                     CR=self.E_ph_unit * u.m * u.m)
+        return {key: u.Quantity(arrays[key], unit, copy=False)
+                for key, unit in units.items()}
+
+    def _defaults(self, **kwargs):
+        return [getattr(self, key) if value is None else value
+                for key, value in kwargs.items()]
+
+    def rate_scale(self, i=None, d=None, A_t=None, f=None):
+        """Return factor converting spectral sums to signal rates.
+
+        `signal_rate` is `spectral_rate` times this factor, which holds the
+        geometry and optics, so rates for other observation parameters only
+        need the factor.
+
+        Parameters
+        ----------
+        i : astropy.unit.angle, optional
+            Incidence angle(s)
+        d : float or array, optional
+            Solar distance(s) in AU
+        A_t : astropy.unit.area, optional
+            Telescope aperture area(s)
+        f : astropy.unit.length, optional
+            Focal length(s)
+
+        Parameters left as None use the instance values, arrays broadcast.
+
+        Returns
+        -------
+        astropy.units.Quantity
+            Factor in units of area
+        """
+        i, d, A_t, f = self._defaults(i=i, d=d, A_t=A_t, f=f)
+        optics = self.A_p * self.T_M1 * self.T_M2 * self.T_s / math.pi
+        return optics * np.cos(i) / d**2 * A_t / f**2
+
+    def _signal_rate(self, i, d, A_t, f):
+        rate = self.spectral_rate * self.rate_scale(i, d, A_t, f)
+        return rate.to(self.E_ph_unit * u.m * u.m)
+
+    def signal_rate_grid(self, i=None, d=None, A_t=None, f=None):
+        """Return `signal_rate` for grids of observation parameters.
+
+        Only the scalar factors change between grid points, so the spectral
+        sum is done once and broadcast over all parameter combinations.
+
+        Parameters
+        ----------
+        i : astropy.unit.angle, optional
+            Incidence angle(s)
+        d : float or array, optional
+            Solar distance(s) in AU
+        A_t : astropy.unit.area, optional
+            Telescope aperture area(s)
+        f : astropy.unit.length, optional
+            Focal length(s)
+
+        Parameters left as None use the instance values. Each 1D array adds
+        an axis to the result, in argument order.
+        """
+        i, d, A_t, f = outer_grid(*self._defaults(i=i, d=d, A_t=A_t, f=f))
+        return self._signal_rate(i, d, A_t, f)
+
+    def SNR_grid(self, i=None, d=None, exp=0.01, A_t=None, f=None):
+        """Return `SNR` for grids of observation parameters and exposures.
+
+        Parameters are like for `signal_rate_grid`, `exp` being the exposure
+        time(s) in seconds. Each 1D array adds an axis to the result, in
+        argument order.
+        """
+        i, d, A_t, f = self._defaults(i=i, d=d, A_t=A_t, f=f)
+        i, d, exp, A_t, f = outer_grid(i, d, exp, A_t, f)
+        rate = self._signal_rate(i, d, A_t, f)
+        return np.sqrt(rate.value * exp)
+
+    def band_responses(self, filters):
+        """Return band weights of `filters` on `waves`, one row per filter.
+
+        The weights of `Filter.band_weights` integrate the linearly
+        interpolated spectra exactly over each band. They are divided by
+        the wavelength step, so that products with spectra are sums over
+        the samples like `spectral_rate`.
+        """
+        waves = self.waves.to_value(u.nm)
+        if hasattr(filters, 'band_weights'):
+            weights = filters.band_weights(waves)
+        else:
+            weights = np.array([filt.band_weights(waves) for filt in filters])
+        return weights / np.gradient(waves)
+
+    def band_spectral_rates(self, filters):
+        "Return `spectral_rate` through each of `filters`."
+        response = self.band_responses(filters)
+        return response @ (self.E_ph * self.resp_ipol * self.QE_ipol)
+
+    def band_signal_rates(self, filters, i=None, d=None):
+        """Return `signal_rate` through each of `filters`.
+
+        Parameters
+        ----------
+        filters : filters.FilterBank or list of filters.Filter
+            Band filters
+        i : astropy.unit.angle, optional
+            Incidence angle, default is the instance value.
+        d : float, optional
+            Solar distance in AU, default is the instance value.
+
+        Returns
+        -------
+        astropy.units.Quantity
+            Signal rate for each band
+        """
+        i, d, A_t, f = self._defaults(i=i, d=d, A_t=None, f=None)
+        rate = self.band_spectral_rates(filters) * \
+            self.rate_scale(i, d, A_t, f)
+        return rate.to(self.E_ph_unit * u.m * u.m)
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+"""Band signal rates for libraries of scene reflectance spectra."""
+
+import numpy as np
+from astropy import units as u
+
+from .utils import memoized
+
+
+def resample_rows(x, xp, fp):
+    """Linearly interpolate every row of `fp` from `xp` to `x`.
+
+    All rows share the grid `xp`, so indices and weights are computed once.
+    Values beyond the ends of `xp` are held constant.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        New grid, 1D
+    xp : np.ndarray
+        Increasing grid of `fp`, 1D
+    fp : np.ndarray
+        Array of shape (n_rows, len(xp))
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (n_rows, len(x))
+    """
+    x = np.clip(x, xp[0], xp[-1])
+    index = np.clip(np.searchsorted(xp, x) - 1, 0, len(xp) - 2)
+    weight = (x - xp[index]) / (xp[index + 1] - xp[index])
+    return fp[:, index] * (1 - weight) + fp[:, index + 1] * weight
+
+
+class SceneRates:
+    """Signal rates through a set of filters for many reflectance spectra.
+
+    The solar photon irradiance, QE, optics and filter transmissions are
+    combined once into a system matrix with one column per band, so that
+    the rates of a whole spectral library are a single matrix product.
+
+    Parameters
+    ----------
+    radiometry : radiometry.Radiometry
+        Provides wavelength grid, solar spectrum, QE, optics and geometry.
+    filters : filters.FilterBank or list of filters.Filter, optional
+        Band filters, without filters the whole wavelength range is one band.
+
+    The system matrix is computed on first use, changes of `radiometry`
+    afterwards require a new instance.
+    """
+
+    def __init__(self, radiometry, filters=None):
+        self._cache = {}
+        self.radiometry = radiometry
+        self.filters = filters
+
+    @property
+    def waves(self):
+        "Return the wavelength grid of the system matrix in nm."
+        return self.radiometry.waves.to_value(u.nm)
+
+    @property
+    def unit(self):
+        return self.radiometry.E_ph_unit * u.m * u.m
+
+    @memoized
+    def system_matrix(self):
+        "Return system throughput as array of shape (n_waves, n_bands)."
+        rad = self.radiometry
+        if self.filters is None:
+            response = np.ones((1, self.waves.size))
+        else:
+            response = rad.band_responses(self.filters)
+        spectral = rad.E_ph * rad.QE_ipol * rad.rate_scale()
+        spectral = spectral.to_value(self.unit)
+        return np.ascontiguousarray((response * spectral).T)
+
+    @property
+    def n_bands(self):
+        return self.system_matrix.shape[1]
+
+    def count_rates(self, spectra, waves=None, chunksize=10000):
+        """Return signal rates of each spectrum in each band.
+
+        Parameters
+        ----------
+        spectra : array-like
+            Reflectances of shape (n_spectra, n_waves), or a single spectrum.
+        waves : array-like, optional
+            Wavelengths of `spectra` in nm, default is the grid of
+            `radiometry`. Other grids are resampled to it.
+        chunksize : int
+            Spectra resampled at once, to bound the memory of resampling.
+
+        Returns
+        -------
+        astropy.units.Quantity
+            Rates of shape (n_spectra, n_bands), in units of
+            `Radiometry.band_signal_rates`.
+        """
+        spectra = np.asarray(spectra, dtype='float')
+        single = spectra.ndim == 1
+        spectra = np.atleast_2d(spectra)
+        matrix = self.system_matrix
+        if waves is None:
+            rates = spectra @ matrix
+        else:
+            waves = np.asarray(waves, dtype='float')
+            rates = np.empty((len(spectra), self.n_bands))
+            for start in range(0, len(spectra), chunksize):
+                chunk = resample_rows(self.waves, waves,
+                                      spectra[start:start + chunksize])
+                rates[start:start + chunksize] = chunk @ matrix
+        if single:
+            rates = rates[0]
+        return rates << self.unit
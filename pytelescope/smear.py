@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+"""Image smear and motion compensation for a camera on an orbiter."""
+
+import numpy as np
+from astropy import units as u
+
+from .utils import AltitudeGrid, outer_grid
+
+
+class Smear(AltitudeGrid):
+    """Along-track image smear during exposures.
+
+    Results are broadcast over a grid with one axis for each array-valued
+    input, in the order altitude (from `orbiter.alt`) and exposure time.
+
+    Parameters
+    ----------
+    camera : cameras.Camera
+        Camera taking the images, lines (`x`) pointing along-track.
+    orbiter : orbiters.Orbiter
+        Orbiter carrying the camera, `alt` may be a 1D array.
+    exp : astropy.unit.time
+        Exposure time(s)
+    max_smear : float
+        Acceptable smear in pixels
+    compensation : float
+        Fraction of the ground motion removed by slewing the spacecraft, 1
+        for tracking at `orbiter.slew_rate`.
+    """
+
+    table_keys = ['exp', 'pixel_scale', 'line_time', 'pixels', 'max_exposure',
+                  'tdi_stages']
+
+    def __init__(self, camera, orbiter, exp, max_smear=1.0, compensation=0.0):
+        self.camera = camera
+        self.orbiter = orbiter
+        alt, self.exp = outer_grid(orbiter.alt, exp)
+        self.alt_shape = np.shape(alt)
+        self.max_smear = max_smear
+        self.compensation = compensation
+
+    @property
+    def pixel_scale(self):
+        "Return along-track ground size of a pixel at nadir."
+        alt = self._along_alt(self.orbiter.alt)
+        return (alt * self.camera.ifov[0]).to(u.m)
+
+    @property
+    def ground_speed(self):
+        "Return footprint speed remaining after motion compensation."
+        v_surf = self._along_alt(self.orbiter.v_surf)
+        return v_surf * (1 - self.compensation)
+
+    @property
+    def line_time(self):
+        "Return time for the footprint to move by one pixel."
+        with np.errstate(divide='ignore'):
+            return (self.pixel_scale / self.ground_speed).to(u.s)
+
+    @property
+    def pixels(self):
+        "Return smear in pixels during the exposure."
+        return (self.exp / self.line_time).decompose().value
+
+    @property
+    def max_exposure(self):
+        "Return longest exposure with at most `max_smear` pixels smear."
+        return self.max_smear * self.line_time
+
+    @property
+    def tdi_stages(self):
+        """Return TDI stages needed to integrate for `exp` without smear.
+
+        A TDI readout has at least one stage, also without remaining motion.
+        """
+        return np.maximum(np.ceil(self.pixels), 1).astype(int)
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+
+"""Time-resolved signal simulation along an orbit."""
+
+import math
+
+import numpy as np
+from astropy import units as u
+
+from .utils import memoized
+
+
+class SignalTimeline:
+    """Signal rates and SNR per band along a circular orbit.
+
+    The solar incidence angle at the sub-spacecraft point follows from the
+    orbit position and the angle `beta` between the orbit plane and the
+    direction to the sun: cos(i) = cos(beta) * cos(u), `u` being the orbit
+    position counted from the point closest to the subsolar point. Samples
+    on the night side have zero signal.
+
+    Parameters
+    ----------
+    orbiter : orbiters.Orbiter
+        Orbiter with scalar altitude
+    radiometry : radiometry.Radiometry
+        Radiometry providing the signal rates
+    filters : filters.FilterBank or list of filters.Filter, optional
+        Band filters, a single unfiltered band if not given.
+    cadence : astropy.unit.time
+        Time between samples
+    exp : float
+        Exposure time in seconds
+    beta : astropy.unit.angle
+        Angle between orbit plane and sun direction at t=0
+    beta_rate : astropy.unit.angle / astropy.unit.time
+        Drift of `beta`, e.g. from nodal precession.
+    phase : astropy.unit.angle
+        Orbit position at t=0
+
+    `zenith_rates` are computed on first use and recomputed only after
+    `radiometry` or `filters` are reassigned, changes of the radiometry
+    object itself afterwards require a new instance.
+    """
+
+    def __init__(self, orbiter, radiometry, filters=None, cadence=10 * u.s,
+                 exp=0.01, beta=0 * u.deg, beta_rate=0 * u.deg / u.day,
+                 phase=0 * u.deg):
+        self._cache = {}
+        self.orbiter = orbiter
+        self.radiometry = radiometry
+        self.filters = filters
+        self.cadence = cadence
+        self.exp = exp
+        self.beta = beta
+        self.beta_rate = beta_rate
+        self.phase = phase
+
+    @property
+    def radiometry(self):
+        return self._radiometry
+
+    @radiometry.setter
+    def radiometry(self, value):
+        self._radiometry = value
+        self._cache.clear()
+
+    @property
+    def filters(self):
+        return self._filters
+
+    @filters.setter
+    def filters(self, value):
+        self._filters = value
+        self._cache.clear()
+
+    @property
+    def n_bands(self):
+        return 1 if self.filters is None else len(self.filters)
+
+    @memoized
+    def zenith_rates(self):
+        "Return signal rate per band for the sun at zenith."
+        if self.filters is None:
+            rate = self.radiometry.signal_rate_grid(i=0 * u.deg)
+            return np.atleast_1d(rate)
+        return self.radiometry.band_signal_rates(self.filters, i=0 * u.deg)
+
+    def n_samples(self, duration):
+        return math.ceil((duration / self.cadence).decompose().value)
+
+    def incidence(self, t):
+        """Return cosine of the solar incidence angle at times `t`.
+
+        Parameters
+        ----------
+        t : np.ndarray
+            Times since start in seconds
+        """
+        T = self.orbiter.T.to_value(u.s)
+        orbit_pos = self.phase.to_value(u.rad) + math.tau * t / T
+        beta = self.beta.to_value(u.rad) + \
+            self.beta_rate.to_value(u.rad / u.s) * t
+        return np.cos(beta) * np.cos(orbit_pos)
+
+    def chunks(self, duration, chunksize=100000):
+        """Yield the timeline in chunks of samples.
+
+        Parameters
+        ----------
+        duration : astropy.unit.time
+            Length of the timeline
+        chunksize : int
+            Number of samples per chunk
+
+        Yields
+        ------
+        dict
+            't' (times in s), 'incidence' (in degrees), 'signal_rate' and
+            'SNR', the latter two of shape (n_samples, n_bands), with signal
+            rates in the unit of `radiometry.signal_rate`.
+        """
+        dt = self.cadence.to_value(u.s)
+        n = self.n_samples(duration)
+        for start in range(0, n, chunksize):
+            t = np.arange(start, min(start + chunksize, n)) * dt
+            yield self._samples(t)
+
+    def _samples(self, t):
+        cos_i = self.incidence(t)
+        rates = self.zenith_rates.value
+        signal = np.clip(cos_i, 0, None)[:, np.newaxis] * rates
+        d = {}
+        d['t'] = t
+        d['incidence'] = np.degrees(np.arccos(cos_i))
+        d['signal_rate'] = signal
+        d['SNR'] = np.sqrt(signal * self.exp)
+        return d
+
+    def run(self, duration):
+        """Return the whole timeline as one chunk, see `chunks`.
+
+        A zero duration gives empty arrays.
+        """
+        dt = self.cadence.to_value(u.s)
+        return self._samples(np.arange(self.n_samples(duration)) * dt)
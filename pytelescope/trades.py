@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+
+"""Parallel trade studies over instrument and orbit parameters."""
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from astropy import units as u
+
+from . import orbiters
+from .detectors import Detector
+from .utils import ordered_map
+
+# Parameters of a trade study with their units and default values, if any.
+# `i`, `d`, `A_t` and `f` default to the values of the Radiometry instance.
+PARAMETERS = {
+    'alt': ('km', None),
+    'A_t': ('m2', None),
+    'f': ('m', None),
+    'x': ('pixels', 2048),
+    'y': ('pixels', 2048),
+    'bits': ('bit', 12),
+    'fov': ('deg', 10.0),
+    'i': ('deg', None),
+    'd': ('AU', None),
+    'exp': ('s', 0.01),
+    'band': ('index into `filters`', 0),
+}
+
+_worker = {}
+
+
+def _init_worker(params, body, constants, radiometry, spectral_rates):
+    "Store read-only data once per worker process."
+    orbiters._body_constants[body.upper()] = constants
+    _worker.update(params=params, body=body, radiometry=radiometry,
+                   spectral_rates=spectral_rates)
+
+
+def grid_columns(params, start, stop):
+    """Return columns of the design points `start` to `stop`.
+
+    Parameters
+    ----------
+    params : dict
+        1D arrays of values per parameter, spanning a Cartesian product in
+        C order.
+    """
+    shape = tuple(len(value) for value in params.values())
+    indices = np.unravel_index(np.arange(start, stop), shape)
+    return {key: value[index] for (key, value), index in
+            zip(params.items(), indices)}
+
+
+def evaluate(columns, body, radiometry, spectral_rates):
+    """Evaluate one chunk of design points.
+
+    Parameters
+    ----------
+    columns : dict
+        1D arrays of equal length for all keys of `PARAMETERS`, in the units
+        given there.
+    body : str
+        Body to orbit
+    radiometry : radiometry.Radiometry
+        Provides optics and spectral data
+    spectral_rates : np.ndarray
+        `Radiometry.spectral_rate` per filter
+
+    Returns
+    -------
+    pd.DataFrame
+        Parameters and results, one row per design point.
+    """
+    orbiter = orbiters.Orbiter(body, columns['alt'] * u.km)
+    orbiter.fast = True
+    detector = Detector(columns['x'], columns['y'], columns['bits'])
+    detector.fast = True
+    scale = radiometry.rate_scale(columns['i'] * u.deg, columns['d'],
+                                  columns['A_t'] * u.m**2,
+                                  columns['f'] * u.m)
+    signal_rate = spectral_rates[columns['band']] * \
+        scale.to_value(u.m**2)
+    d = dict(columns)
+    d['T'] = orbiter.T.to_value(u.s)
+    d['v_surf'] = orbiter.v_surf.to_value(u.m / u.s)
+    d['slew_rate'] = orbiter.slew_rate.to_value(u.deg / u.s)
+    d['pixel_scale'] = columns['alt'] * 1e3 * \
+        np.deg2rad(columns['fov']) / columns['x']
+    d['total_mbits'] = detector.total_mbits.to_value(u.Mbit)
+    d['signal_rate'] = signal_rate
+    d['SNR'] = np.sqrt(signal_rate * columns['exp'])
+    return pd.DataFrame(d)
+
+
+def _evaluate_rows(start, stop):
+    return evaluate(grid_columns(_worker['params'], start, stop),
+                    _worker['body'], _worker['radiometry'],
+                    _worker['spectral_rates'])
+
+
+class TradeStudy:
+    """Evaluate the Cartesian product of instrument and orbit parameters.
+
+    Parameters
+    ----------
+    body : str
+        Body to orbit
+    radiometry : radiometry.Radiometry
+        Provides spectral data, optics and default observation parameters.
+    filters : filters.FilterBank or list of filters.Filter, optional
+        Candidate filters, selected by the 'band' parameter. Without
+        filters the whole wavelength range of `radiometry` is used.
+    params : dict
+        Values to sweep for keys of `PARAMETERS`, in the units given there.
+        Parameters not given use their default.
+    """
+
+    def __init__(self, body, radiometry, filters=None, **params):
+        unknown = set(params) - set(PARAMETERS)
+        if unknown:
+            raise ValueError(f"Unknown trade parameters: {sorted(unknown)}")
+        self.body = body
+        self.radiometry = radiometry
+        self.filters = filters
+        defaults = {key: default for key, (_, default) in PARAMETERS.items()}
+        defaults['i'] = radiometry.i.to_value(u.deg)
+        defaults['d'] = radiometry.d
+        defaults['A_t'] = radiometry.A_t.to_value(u.m**2)
+        defaults['f'] = radiometry.f.to_value(u.m)
+        defaults.update(params)
+        if defaults['alt'] is None:
+            raise ValueError("Altitudes 'alt' are required.")
+        self.params = {key: np.atleast_1d(value)
+                       for key, value in defaults.items()}
+
+    @property
+    def shape(self):
+        return tuple(len(value) for value in self.params.values())
+
+    def __len__(self):
+        return math.prod(self.shape)
+
+    def columns(self, start, stop):
+        "Return parameter columns for the design points `start` to `stop`."
+        return grid_columns(self.params, start, stop)
+
+    @property
+    def spectral_rates(self):
+        if self.filters is None:
+            rates = np.atleast_1d(self.radiometry.spectral_rate)
+        else:
+            rates = self.radiometry.band_spectral_rates(self.filters)
+        return rates.to_value(self.radiometry.E_ph_unit)
+
+    def chunks(self, chunksize=100000, jobs=1):
+        """Yield results for consecutive chunks of design points.
+
+        Parameters
+        ----------
+        chunksize : int
+            Design points per chunk
+        jobs : int
+            Number of worker processes, 1 to evaluate in this process.
+
+        Yields
+        ------
+        pd.DataFrame
+            Results of `evaluate`, in order of the design points. An empty
+            study yields one empty DataFrame with all columns.
+
+        At most 2 * `jobs` chunks are evaluated ahead of the consumer.
+        """
+        bounds = [(start, min(start + chunksize, len(self)))
+                  for start in range(0, len(self), chunksize)]
+        rates = self.spectral_rates
+        if jobs == 1 or not bounds:
+            for start, stop in bounds or [(0, 0)]:
+                yield evaluate(self.columns(start, stop), self.body,
+                               self.radiometry, rates)
+            return
+        initargs = (self.params, self.body,
+                    orbiters.body_constants(self.body),
+                    self.radiometry, rates)
+        with ProcessPoolExecutor(jobs, initializer=_init_worker,
+                                 initargs=initargs) as executor:
+            yield from ordered_map(executor, _evaluate_rows, bounds,
+                                   2 * jobs)
+
+    def run(self, path=None, chunksize=100000, jobs=1):
+        """Evaluate all design points.
+
+        Parameters
+        ----------
+        path : str or pathlib.Path, optional
+            Parquet (.parquet) or HDF5 (.h5, .hdf5) file that results are
+            written to chunk by chunk. If not given, results are returned.
+        chunksize, jobs
+            See `chunks`.
+
+        Returns
+        -------
+        pd.DataFrame or None
+            All results if `path` is None.
+        """
+        chunks = self.chunks(chunksize=chunksize, jobs=jobs)
+        if path is None:
+            return pd.concat(chunks, ignore_index=True)
+        path = Path(path)
+        if path.suffix == '.parquet':
+            write_parquet(chunks, path)
+        elif path.suffix in ['.h5', '.hdf5']:
+            write_hdf5(chunks, path)
+        else:
+            raise ValueError(f"Unknown result file type: {path.suffix}")
+
+
+def write_parquet(chunks, path):
+    "Write DataFrames `chunks` to Parquet file `path` incrementally."
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for df in chunks:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_hdf5(chunks, path, group='results'):
+    "Write DataFrames `chunks` as resizable datasets to HDF5 file `path`."
+    import h5py
+
+    with h5py.File(path, 'w') as f:
+        g = f.create_group(group)
+        for df in chunks:
+            for col in df.columns:
+                values = df[col].to_numpy()
+                if col not in g:
+                    g.create_dataset(col, data=values, maxshape=(None,),
+                                     chunks=True)
+                    continue
+                dset = g[col]
+                n = dset.shape[0]
+                dset.resize((n + len(values),))
+                dset[n:] = values
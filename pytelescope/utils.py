@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+"""Helpers shared between the pytelescope modules."""
+
+import collections
+import functools
+
+import numpy as np
+
+
+def memoized(func):
+    """Property that caches its value on the instance.
+
+    The cache lives in `self._cache` and has to be cleared by the owning
+    class whenever an input of the calculation is reassigned.
+    """
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(self):
+        try:
+            return self._cache[name]
+        except KeyError:
+            value = self._cache[name] = func(self)
+            return value
+    return property(wrapper)
+
+
+def outer_grid(*values):
+    """Reshape values so that every 1D array spans its own axis.
+
+    Scalars don't add an axis, so broadcasting the results gives an array
+    with one dimension per array argument, in argument order.
+    """
+    ndim = sum(np.ndim(value) == 1 for value in values)
+    grid = []
+    axis = 0
+    for value in values:
+        if np.ndim(value) > 1:
+            raise ValueError("Only scalars and 1D arrays can span a grid.")
+        if np.ndim(value) == 1:
+            shape = [1] * ndim
+            shape[axis] = -1
+            value = np.reshape(value, shape)
+            axis += 1
+        grid.append(value)
+    return grid
+
+
+class AltitudeGrid:
+    """Base for results on an `outer_grid` with the orbit altitude first.
+
+    Subclasses set `orbiter` and `alt_shape`, the shape of the altitude
+    from `outer_grid`, and list the attributes returned by `table` in
+    `table_keys`.
+    """
+
+    table_keys = []
+
+    def _along_alt(self, value):
+        "Reshape orbiter quantity `value` to the altitude axis of the grid."
+        return np.reshape(value, self.alt_shape)
+
+    def table(self):
+        """Return all results, broadcast to the full grid.
+
+        Returns
+        -------
+        dict
+            Arrays of the grid shape, keyed by result name.
+        """
+        values = [getattr(self, key) for key in self.table_keys]
+        shape = np.broadcast_shapes(self.alt_shape,
+                                    *[np.shape(value) for value in values])
+        d = {}
+        d['alt'] = np.broadcast_to(self._along_alt(self.orbiter.alt), shape,
+                                   subok=True)
+        for key, value in zip(self.table_keys, values):
+            d[key] = np.broadcast_to(value, shape, subok=True)
+        return d
+
+
+def ordered_map(executor, func, args, window):
+    """Yield `func(*a)` for each `a` of `args` in order, using `executor`.
+
+    Unlike `Executor.map`, at most `window` calls are submitted ahead of the
+    consumer, so finished results don't pile up in memory when the workers
+    are faster than the consumer.
+    """
+    pending = collections.deque()
+    for a in args:
+        if len(pending) >= window:
+            yield pending.popleft().result()
+        pending.append(executor.submit(func, *a))
+    while pending:
+        yield pending.popleft().result()
@@ -14,7 +14,8 @@ with open('HISTORY.rst') as history_file:
 requirements = [
     'astropy',
     'scipy',
-    'pyspectral'
+    'pyspectral',
+    'pyyaml',
     # TODO: put package requirements here
 ]
 
@@ -43,6 +44,14 @@ setup(
         'pytelescope': ['data/*']
     },
     install_requires=requirements,
+    extras_require={
+        'trades': ['pyarrow', 'h5py'],
+    },
+    entry_points={
+        'console_scripts': [
+            'pytelescope=pytelescope.cli:main',
+        ],
+    },
     license="ISC license",
     zip_safe=False,
     keywords='pytelescope',
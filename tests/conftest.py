@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+
+"""Shared fixtures for the pytelescope tests."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pytelescope import datasets
+
+
+@pytest.fixture(autouse=True, scope='session')
+def data_cache_dir(tmp_path_factory):
+    "Keep .npz caches of parsed tables out of the user's cache directory."
+    default = datasets.cache_dir
+    datasets.cache_dir = tmp_path_factory.mktemp('cache')
+    yield datasets.cache_dir
+    datasets.cache_dir = default
+
+
+@pytest.fixture()
+def spectra_path(tmp_path, monkeypatch):
+    waves = np.arange(210, 1200, 10)
+    pd.DataFrame({'Wavelength[nm]': waves,
+                  'Reflectance': np.linspace(0.05, 0.3, waves.size)}
+                 ).to_csv(tmp_path / 'giza_crism_blue_halos.csv', index=False)
+    waves = np.arange(250, 1100, 25)
+    pd.DataFrame({'Wavelength[nm]': waves,
+                  'QE[%]': 60 * np.sin(np.linspace(0.1, 3.0, waves.size))}
+                 ).to_csv(tmp_path / 'midband_coated_QE.csv', index=False)
+    monkeypatch.setattr(datasets, 'search_path',
+                        [tmp_path] + datasets.search_path)
+    datasets.clear()
+    yield tmp_path
+    datasets.clear()
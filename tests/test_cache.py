@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for `pytelescope.cache` module."""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from astropy import units as u
+
+from pytelescope import cache, detectors, radiometry
+
+
+def test_hash_inputs():
+    a = np.arange(5.0)
+    assert cache.hash_inputs(a, 1) == cache.hash_inputs(a.copy(), 1)
+    assert cache.hash_inputs(a, 1) != cache.hash_inputs(a, 2)
+    assert cache.hash_inputs(a) != cache.hash_inputs(a.astype('float32'))
+    assert cache.hash_inputs(1 * u.m) != cache.hash_inputs(1 * u.km)
+    assert cache.hash_inputs({'a': 1, 'b': 2}) == \
+        cache.hash_inputs({'b': 2, 'a': 1})
+
+
+def test_result_cache_roundtrip(tmp_path):
+    store = cache.ResultCache(tmp_path)
+    assert store.get('key') is None
+    arrays = store.put('key', {'x': np.arange(10.0)})
+    assert 'key' in store
+    assert isinstance(arrays['x'], np.memmap)
+    with pytest.raises(ValueError):
+        arrays['x'][0] = 1
+    assert store.get('key')['x'] == pytest.approx(np.arange(10.0))
+
+
+def test_result_cache_evicts_least_recently_used(tmp_path):
+    store = cache.ResultCache(tmp_path, max_bytes=2500)
+    for i, key in enumerate(['a', 'b']):
+        store.put(key, {'x': np.zeros(100)})
+        os.utime(tmp_path / key, (i, i))
+    store.get('a')
+    store.put('c', {'x': np.zeros(100)})
+    assert 'b' not in store
+    assert 'a' in store and 'c' in store
+    assert store.size <= 2500
+
+
+def test_radiometry_results_are_shared(spectra_path, tmp_path):
+    store = cache.ResultCache(tmp_path)
+    rad = radiometry.Radiometry()
+    first = rad.results(store)
+    assert len(store.entries()) == 1
+    assert first['CR'].value == pytest.approx(rad.CR.value)
+    assert first['L_surf'].value == pytest.approx(rad.L_surf.value)
+    again = radiometry.Radiometry().results(store)
+    assert isinstance(again['E_ph'].base, np.memmap)
+    assert again['CR'].unit == rad.CR.unit
+    rad.i = 30 * u.deg
+    rad.results(store)
+    assert len(store.entries()) == 2
+
+
+def test_radiometry_cache_key_depends_on_qe_type(spectra_path):
+    waves = np.array([300.0, 500.0, 700.0, 900.0])
+    qe = np.array([0.0, 0.5, 0.25, 0.0])
+    table = radiometry.Radiometry()
+    table.QE = pd.DataFrame({'Wavelength[nm]': waves, 'QE[%]': 100 * qe})
+    curve = radiometry.Radiometry()
+    curve.QE = detectors.QECurve(waves, qe)
+    # equal samples, but the table is extrapolated beyond 300 and 900 nm
+    assert curve.cache_key != table.cache_key
+    assert curve.QE_ipol != pytest.approx(table.QE_ipol)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for `pytelescope.cameras` module."""
+
+import numpy as np
+import pytest
+from astropy import units as u
+
+from pytelescope import cameras, detectors
+
+
+@pytest.fixture
+def camera():
+    return cameras.Camera(compression=5, fov=10, n_bandpasses=4,
+                          x=2048, y=1024, bits=12, read_noise=10)
+
+
+def test_camera_detector_attributes(camera):
+    assert isinstance(camera.ccd, detectors.Detector)
+    assert camera.x == 2048
+    assert camera.y == 1024
+    assert camera.read_noise == 10
+    assert camera.total_mbits.value == pytest.approx(2048 * 1024 * 12 / 1e6)
+    with pytest.raises(AttributeError):
+        camera.not_an_attribute
+
+
+def test_camera_with_detector():
+    ccd = detectors.Detector(1000, 1000, 8)
+    camera = cameras.Camera(compression=2, detector=ccd)
+    assert camera.ccd is ccd
+    assert camera.img_compressed_size.value == pytest.approx(4)
+
+
+def test_camera_cache_invalidation(camera):
+    size = camera.img_set_size
+    assert camera.img_set_size is size
+    camera.compression = 10
+    assert camera.img_set_size.value == pytest.approx(size.value / 2)
+    ifov = camera.ifov
+    camera.fov = 20
+    assert camera.ifov[0] == pytest.approx(2 * ifov[0])
+    camera.ccd = detectors.Detector(4096, 1024, 12)
+    assert camera.ifov[0] == pytest.approx(ifov[0])
+
+
+def test_catalog_matches_cameras(camera):
+    other = cameras.Camera(compression=3, fov=20, n_bandpasses=2,
+                           x=1024, y=1024, bits=10)
+    catalog = cameras.CameraCatalog.from_cameras([camera, other])
+    assert len(catalog) == 2
+    for i, cam in enumerate([camera, other]):
+        assert catalog.ifov[0][i] == pytest.approx(cam.ifov[0])
+        assert catalog.ifov_mrad[1][i] == pytest.approx(cam.ifov_mrad[1])
+        assert catalog.img_set_size[i].value == \
+            pytest.approx(cam.img_set_size.value)
+        assert catalog[i].img_compressed_size.value == \
+            pytest.approx(cam.img_compressed_size.value)
+    assert catalog.total_mbits.unit == u.Mbit
+
+
+def test_catalog_frame_roundtrip():
+    catalog = cameras.CameraCatalog(np.arange(1, 301) * 16, 1024, 12,
+                                    compression=[2, 4, 8] * 100)
+    df = catalog.to_frame()
+    assert len(df) == 300
+    assert df.img_set_size.to_numpy() == \
+        pytest.approx(catalog.img_set_size.value)
+    again = cameras.CameraCatalog.from_frame(df)
+    assert again.ifov[0] == pytest.approx(catalog.ifov[0])
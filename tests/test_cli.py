@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for `pytelescope.cli` module."""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+from pytelescope import cli, orbiters
+
+CONFIG = """\
+orbiter:
+  body: mars
+  alt: [300, 400]
+camera:
+  compression: 5
+  fov: 10
+  detector: {x: 1024, y: 512, bits: 8}
+radiometry:
+  i: 60
+  exp: 0.05
+filters:
+  - {center: 500, width: 50, transmission: 0.9}
+  - {center: 700, width: 50, transmission: 0.9, profile: gaussian}
+trade:
+  f: [1.3, 1.6]
+"""
+
+
+def test_help_does_not_load_heavy_modules():
+    code = ("import sys\n"
+            "from pytelescope import cli\n"
+            "try:\n"
+            "    cli.main(['run', '--help'])\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "heavy = ['astropy', 'matplotlib', 'pyspectral', 'spiceypy']\n"
+            "print([m for m in heavy if m in sys.modules])\n")
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True,
+                         text=True, check=True).stdout
+    assert out.splitlines()[-1] == '[]'
+
+
+@pytest.fixture()
+def body_constants():
+    "Keep constants cached with `--no-spice` out of the other tests."
+    orbiters.clear_body_constants()
+    yield
+    orbiters.clear_body_constants()
+
+
+def test_run_writes_json(spectra_path, tmp_path, monkeypatch,
+                         body_constants):
+    monkeypatch.setattr(orbiters, 'use_spice', True)
+    config = tmp_path / 'config.yaml'
+    config.write_text(CONFIG)
+    output = tmp_path / 'results.json'
+    assert cli.main(['run', str(config), '-o', str(output),
+                     '--no-spice']) == 0
+    results = json.loads(output.read_text())
+    assert results['orbiter']['T']['value'][0] < \
+        results['orbiter']['T']['value'][1]
+    assert results['camera']['img_set_size']['unit'] == 'Mbit'
+    assert len(results['radiometry']['band_SNR']) == 2
+    trade = results['trade']
+    assert len(trade['SNR']) == 4
+    assert trade['alt'] == [300, 300, 400, 400]
+    assert trade['i'][0] == pytest.approx(60)
+    assert set(trade['x']) == {1024}
+    assert set(trade['y']) == {512}
+    assert set(trade['bits']) == {8}
+    assert set(trade['fov']) == {10}
+    assert set(trade['exp']) == {0.05}
+    # same design point as the radiometry section with the default f
+    rad = results['radiometry']
+    assert trade['SNR'][0] == pytest.approx(rad['band_SNR'][0])
+
+
+def test_trade_without_body(spectra_path):
+    config = {'trade': {'alt': [300], 'exp': [0.01]}}
+    with pytest.raises(ValueError, match="'body'"):
+        cli.evaluate(config)
@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for `pytelescope.compression` module."""
+
+import numpy as np
+import pytest
+from astropy import units as u
+
+from pytelescope import (cameras, compression, datavolume, detectors,
+                         frames, orbiters)
+
+
+@pytest.fixture
+def noisy():
+    detector = detectors.Detector(256, 256, 12, read_noise=5.0)
+    return frames.FrameSimulator(detector, 1e4, exp=0.1, seed=0).run()
+
+
+def test_residuals_and_entropy():
+    tile = np.array([[3, 4, 2, 2]])
+    assert compression.residuals(tile).tolist() == [[6, 2, 3, 0]]
+    assert compression.entropy([1, 1, 2, 2]) == pytest.approx(1)
+    assert compression.entropy(np.zeros(10, dtype=int)) == 0
+
+
+def test_noise_limits_compression(noisy):
+    ratios = compression.estimate_compression(noisy, 12, tile=(64, 64))
+    assert set(ratios) == set(compression.METHODS)
+    # Gaussian noise of ~32 electrons rms leaves about 7 of 12 bits
+    assert ratios['entropy'] == pytest.approx(12 / 7, rel=0.1)
+    for method in ['zlib', 'bz2', 'lzma']:
+        assert 1 < ratios[method] < ratios['entropy']
+
+
+def test_flat_images_compress_well():
+    images = np.full((2, 128, 128), 100, dtype='uint16')
+    ratios = compression.estimate_compression(images, 12, jobs=1)
+    assert ratios['entropy'] == np.inf
+    assert ratios['zlib'] > 50
+
+
+def test_calibrate_updates_data_volume(noisy):
+    camera = cameras.Camera(compression=10, fov=10, x=256, y=256, bits=12)
+    orbiter = orbiters.MarsOrbiter(400 * u.km)
+    before = datavolume.DataVolume(camera, orbiter).mbits_per_day
+    size = camera.img_set_size
+    ratio = compression.calibrate(camera, noisy, method='zlib')
+    assert camera.compression == ratio < 10
+    assert camera.img_set_size > size
+    after = datavolume.DataVolume(camera, orbiter).mbits_per_day
+    assert after.value == pytest.approx(before.value * 10 / ratio)
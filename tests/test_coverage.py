@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for `pytelescope.coverage` module."""
+
+import numpy as np
+import pytest
+from astropy import units as u
+
+from pytelescope import cameras, coverage, orbiters
+
+
+@pytest.fixture
+def cov():
+    orbiter = orbiters.MarsOrbiter(400 * u.km)
+    camera = cameras.Camera(fov=20, x=2048, y=2048, bits=12)
+    return coverage.Coverage(orbiter, camera, resolution=1.0)
+
+
+def test_swath_intervals_of_polar_orbit(cov):
+    rows, starts, widths = cov.swath_intervals()
+    half_angle = (cov.swath_width / 2 / cov.orbiter.R_body).decompose()
+    equator = rows == 90
+    assert equator.sum() == 2
+    assert widths[equator] == pytest.approx(
+        2 * np.degrees(half_angle.value), rel=1e-3)
+    # the body rotates by half of lon_per_orbit between the two passes
+    assert np.diff(starts[equator])[0] == pytest.approx(
+        180 - cov.lon_per_orbit / 2, rel=1e-3)
+    assert (widths[rows == 179] == 360).all()
+
+
+def brute_force_coverage(cov, n_samples=10000):
+    "Return cells within half the swath of the sampled body-fixed track."
+    half_angle = (cov.swath_width / 2 / cov.orbiter.R_body).decompose().value
+    inc = cov.inclination.to_value(u.rad)
+    arg = np.linspace(0, 2 * np.pi, n_samples, endpoint=False)
+    lat = np.arcsin(np.sin(inc) * np.sin(arg))
+    lon = cov.raan.to_value(u.rad) + \
+        np.arctan2(np.cos(inc) * np.sin(arg), np.cos(arg)) - \
+        arg * np.deg2rad(cov.lon_per_orbit) / (2 * np.pi)
+    track = np.stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon),
+                      np.sin(lat)])
+    lons = np.deg2rad(cov.lons)
+    covered = np.zeros(cov.shape, dtype=bool)
+    for row, phi in enumerate(np.deg2rad(cov.lats)):
+        cells = np.stack([np.cos(phi) * np.cos(lons),
+                          np.cos(phi) * np.sin(lons),
+                          np.full(lons.size, np.sin(phi))])
+        covered[row] = (cells.T @ track).max(axis=1) >= np.cos(half_angle)
+    return covered
+
+
+@pytest.mark.parametrize('inclination', [60, 120])
+def test_swath_follows_rotating_ground_track(cov, inclination):
+    cov.inclination = inclination * u.deg
+    counts = cov.run(1, jobs=1) > 0
+    expected = brute_force_coverage(cov)
+    # the sampled track starts and ends at the ascending node, where
+    # consecutive orbits of `run` join
+    away = np.abs(cov.lats) > 2
+    counts, expected = counts[away], expected[away]
+    assert np.count_nonzero(counts != expected) <= 0.005 * expected.sum()
+    assert np.abs(counts.sum(axis=1) - expected.sum(axis=1)).max() <= 1
+
+
+@pytest.mark.parametrize('lat', [75.5, 85.5, 88.5])
+def test_no_holes_at_high_latitudes(cov, lat):
+    counts = cov.run(1, jobs=1)
+    covered = np.flatnonzero(counts[cov.lats == lat][0])
+    # ascending and descending pass give at most two runs of cells,
+    # which may wrap around at longitude 0
+    gaps = np.count_nonzero(np.diff(covered) > 1)
+    assert covered.size > 2
+    assert gaps <= 2
+
+
+def test_single_orbit_covers_a_strip(cov):
+    cov.resolution = 0.2
+    counts = cov.run(1, jobs=1)
+    assert counts.shape == (900, 1800)
+    assert counts.dtype == np.uint8
+    assert counts.max() == 1
+    swath = cov.swath_width.to_value(u.km)
+    # a great circle strip covers swath / (2 R) of the sphere
+    R_body = cov.orbiter.R_body.to_value(u.km)
+    assert cov.fraction(counts) == pytest.approx(swath / 2 / R_body,
+                                                 rel=0.2)
+
+
+def test_chunks_add_up_incrementally(cov):
+    total = cov.run(12, chunksize=5, jobs=1)
+    counts = cov.run(5, jobs=1)
+    counts = cov.run(7, jobs=1, first=5, counts=counts)
+    np.testing.assert_array_equal(counts, total)
+    assert total.max() <= 12
+    assert cov.fraction(total) > cov.fraction(cov.run(1, jobs=1))
+
+
+def test_continued_counts_are_promoted(cov):
+    counts = cov.run(10, jobs=1)
+    assert counts.dtype == np.uint8
+    counts = cov.run(300, chunksize=100, jobs=1, first=10, counts=counts)
+    assert counts.dtype == np.uint16
+    np.testing.assert_array_equal(counts, cov.run(310, jobs=1))
+
+
+def test_zero_orbits(cov):
+    assert cov.run(0, jobs=2).max() == 0
+    assert list(cov.chunks(0)) == []
+
+
+def test_parallel_matches_serial(cov):
+    np.testing.assert_array_equal(cov.run(6, chunksize=2, jobs=2),
+                                  cov.run(6, jobs=1))
+
+
+def test_interleaved_chunks(cov):
+    other = coverage.Coverage(cov.orbiter, cov.camera,
+                              inclination=60 * u.deg, resolution=2.0)
+    expected = [list(c.chunks(4, chunksize=2, jobs=1)) for c in [cov, other]]
+    generators = [c.chunks(4, chunksize=2, jobs=1) for c in [cov, other]]
+    for _ in range(2):
+        for generator, chunks in zip(generators, expected):
+            np.testing.assert_array_equal(next(generator), chunks.pop(0))
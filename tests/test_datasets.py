@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for `pytelescope.datasets` module."""
+
+import pandas as pd
+import pytest
+
+from pytelescope import datasets, detectors
+
+
+@pytest.fixture()
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(datasets, 'search_path', [tmp_path])
+    monkeypatch.setattr(datasets, 'cache_dir', tmp_path / 'cache')
+    monkeypatch.setattr(datasets, 'registry', dict(datasets.registry))
+    datasets.clear()
+    yield tmp_path
+    datasets.clear()
+
+
+def test_load_caches_parsed_table(data_dir, monkeypatch):
+    df = pd.DataFrame({'Filter': ['UV', 'IR1'], 'center': [365.0, 900.0]})
+    df.to_csv(data_dir / 'akatsuki_cameras.csv', index=False)
+    datasets.register('akatsuki_cameras', 'akatsuki_cameras.csv',
+                      index_col=0)
+    first = datasets.load('akatsuki_cameras')
+    assert len(list((data_dir / 'cache').glob('akatsuki_cameras-*.npz'))) == 1
+    assert not list(data_dir.glob('*.npz'))
+    datasets.clear()
+    monkeypatch.setattr(datasets.pd, 'read_csv', None)
+    cached = datasets.load('akatsuki_cameras')
+    pd.testing.assert_frame_equal(cached, first, check_index_type=False)
+    assert cached.loc['IR1', 'center'] == 900.0
+
+
+def test_cache_depends_on_read_options(data_dir):
+    pd.DataFrame({'Filter': ['UV'], 'center': [365.0]}).to_csv(
+        data_dir / 'cams.csv', index=False)
+    datasets.register('cams', 'cams.csv', index_col=0)
+    assert list(datasets.load('cams').columns) == ['center']
+    datasets.register('cams', 'cams.csv')
+    assert list(datasets.load('cams').columns) == ['Filter', 'center']
+
+
+def test_missing_data_file(data_dir):
+    with pytest.raises(FileNotFoundError):
+        datasets.load('giza_crism_blue_halos')
+
+
+def test_bundled_cmosis_qe_is_lazy(monkeypatch):
+    monkeypatch.delitem(vars(detectors), 'cmosis_qe', raising=False)
+    assert 'cmosis_qe' not in vars(detectors)
+    assert detectors.cmosis_qe.waves.size == 162
+    assert 'cmosis_qe' in vars(detectors)
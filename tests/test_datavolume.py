@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for `pytelescope.datavolume` module."""
+
+import numpy as np
+import pytest
+from astropy import units as u
+
+from pytelescope import cameras, datavolume, orbiters
+
+
+@pytest.fixture()
+def camera():
+    return cameras.Camera(compression=5, fov=10, n_bandpasses=4,
+                          x=2048, y=2048, bits=12)
+
+
+def test_data_volume_scalar(camera):
+    orb = orbiters.MarsOrbiter(350 * u.km)
+    dv = datavolume.DataVolume(camera, orb, overlap=0, duty_cycle=1)
+    assert dv.footprint.value == pytest.approx(350 * np.deg2rad(10))
+    assert dv.images_per_orbit == np.ceil(
+        (orb.surface_circumference / dv.footprint).decompose().value)
+    assert dv.mbits_per_orbit.to(u.Mbit).value == pytest.approx(
+        dv.images_per_orbit * camera.img_set_size.value)
+
+
+def test_data_volume_grid(camera):
+    orb = orbiters.MarsOrbiter([250, 350, 500] * u.km)
+    dv = datavolume.DataVolume(camera, orb, compression=[2, 5],
+                               n_bandpasses=np.arange(1, 9))
+    table = dv.table()
+    assert table['downlink_rate'].shape == (3, 2, 8)
+    assert table['alt'][:, 0, 0].value == pytest.approx([250, 350, 500])
+    rates = table['downlink_rate'].value
+    assert np.all(rates[:, 0] > rates[:, 1])
+    assert np.all(np.diff(rates, axis=2) > 0)
+    single = datavolume.DataVolume(camera, orbiters.MarsOrbiter(350 * u.km),
+                                   compression=2, n_bandpasses=3)
+    assert single.downlink_rate.value == pytest.approx(rates[1, 0, 2])
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for `pytelescope.detectors` module."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from astropy import units as u
+
+from pytelescope import detectors, radiometry
+
+
+def test_qe_curve_is_compact():
+    curve = detectors.QECurve([500, 300, 400], [0.5, 0.3, 0.4])
+    assert not hasattr(curve, '__dict__')
+    assert list(curve.waves) == [300, 400, 500]
+    assert curve.qe.flags.c_contiguous and not curve.qe.flags.writeable
+    grid = np.arange(250, 600, 50.0)
+    resampled = curve.resample(grid)
+    assert resampled == pytest.approx([0, 0.3, 0.35, 0.4, 0.45, 0.5, 0])
+    assert curve.resample(grid.copy()) is resampled
+
+
+def test_qe_curve_cache_is_lru():
+    curve = detectors.QECurve([300, 500], [0.3, 0.5])
+    first = curve.resample([400.0])
+    for i in range(7):
+        curve.resample([410.0 + i])
+    assert curve.resample([400.0]) is first
+    curve.resample([450.0])
+    assert curve.resample([400.0]) is first
+    assert curve.resample([400.0, 400.0]).shape == (2,)
+
+
+@pytest.mark.parametrize('qe', [
+    'cmosis_mono_qe',
+    pd.DataFrame({'waves': [400, 600], 'qe': [40, 60]}),
+    pd.Series([40, 60], index=[400, 600]),
+])
+def test_detector_qe_inputs(qe):
+    det = detectors.Detector(1024, 1024, 12, qe=qe)
+    assert isinstance(det.qe, detectors.QECurve)
+    assert det.qe.resample([500])[0] == pytest.approx(0.5, abs=0.2)
+
+
+def test_qe_matches_curve():
+    qe = detectors.cmosis_qe
+    assert qe.waves.unit == u.nm
+    assert qe.qe.to_value(u.dimensionless_unscaled) == pytest.approx(
+        qe.curve.qe)
+
+
+def test_radiometry_uses_detector_qe(spectra_path):
+    det = detectors.Detector(1024, 1024, 12, qe='cmosis_mono_qe')
+    rad = radiometry.Radiometry(detector=det)
+    assert rad.QE is det.qe
+    assert rad.QE_ipol is det.qe.resample(rad.waves.value)
+    assert rad.signal_rate.value > 0
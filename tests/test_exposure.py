@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for `pytelescope.exposure` module."""
+
+import numpy as np
+import pytest
+from astropy import units as u
+
+from pytelescope import detectors, exposure, radiometry
+
+
+@pytest.fixture()
+def noise():
+    det = detectors.Detector(2048, 2048, 12, read_noise=10,
+                             dark_current=50, gain=4)
+    return exposure.NoiseModel.from_detector(det)
+
+
+def test_exposure_inverts_snr(noise):
+    rates = np.logspace(2, 7, 20)
+    snr = np.array([10, 50, 200])[:, np.newaxis]
+    exp = noise.exposure(rates, snr)
+    assert exp.shape == (3, 20)
+    assert noise.SNR(rates, exp) == pytest.approx(
+        np.broadcast_to(snr, exp.shape))
+
+
+def test_shot_noise_matches_radiometry_snr(spectra_path):
+    rad = radiometry.Radiometry()
+    result = exposure.required_exposure(rad.signal_rate, rad.SNR(0.02))
+    assert result['exp'] == pytest.approx(0.02)
+    assert not result['saturated']
+
+
+def test_saturation(noise):
+    assert noise.saturation == 4095 * 4
+    result = exposure.required_exposure([1e5, 1e2], 100, noise)
+    assert list(result['saturated']) == [False, True]
+    assert result['saturation_margin'] == pytest.approx(
+        1 - result['exp'] / noise.max_exposure([1e5, 1e2]))
+    rates = [1e5, 1e2] * u.Hz
+    assert exposure.required_exposure(rates, 100, noise)['exp'] == \
+        pytest.approx(result['exp'])
@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests that the unit-stripped fast paths match the Quantity paths."""
+
+import numpy as np
+import pytest
+from astropy import units as u
+
+from pytelescope import detectors, orbiters, radiometry
+
+
+def assert_equivalent(fast, slow):
+    assert fast.unit.is_equivalent(slow.unit)
+    assert np.shape(fast) == np.shape(slow)
+    assert np.allclose(fast.to_value(slow.unit), slow.value,
+                       rtol=1e-12, atol=0)
+
+
+@pytest.mark.parametrize('orbiter', [
+    lambda: orbiters.MarsOrbiter(350 * u.km),
+    lambda: orbiters.VenusOrbiter(np.linspace(200, 5000, 50) * u.km),
+    lambda: orbiters.OrbiterGrid(['MARS', 'EARTH'], [300, 400] * u.km),
+])
+@pytest.mark.parametrize('attr', ['v', 'T', 'v_surf', 'slew_rate'])
+def test_orbiter_fast_path(orbiter, attr):
+    slow = orbiter()
+    fast = orbiter()
+    fast.fast = True
+    assert_equivalent(getattr(fast, attr), getattr(slow, attr))
+    assert_equivalent(fast.ground_travel(10 * u.s),
+                      slow.ground_travel(10 * u.s))
+
+
+def test_detector_fast_path():
+    slow = detectors.Detector(2048, 1024, 12)
+    fast = detectors.Detector(2048, 1024, 12)
+    fast.fast = True
+    assert_equivalent(fast.total_mbits, slow.total_mbits)
+
+
+@pytest.mark.parametrize('attr', ['E_ph', 'L_surf', 'CR', 'signal_rate'])
+def test_radiometry_fast_path(spectra_path, attr):
+    slow = radiometry.Radiometry(i=30 * u.deg, d=0.72)
+    fast = radiometry.Radiometry(i=30 * u.deg, d=0.72)
+    fast.fast = True
+    assert_equivalent(getattr(fast, attr), getattr(slow, attr))
+    assert fast.SNR(0.01) == pytest.approx(slow.SNR(0.01), rel=1e-12)
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for `pytelescope.filters` module."""
+
+import numpy as np
+import pytest
+from astropy import units as u
+
+from pytelescope import filters
+
+
+@pytest.fixture()
+def constant_filters():
+    return [filters.ConstantFilter(center, 50, 0.9)
+            for center in [365, 550, 700, 900]]
+
+
+def test_filter_bank_matches_constant_filters(constant_filters):
+    bank = filters.FilterBank.from_filters(constant_filters)
+    d = bank.response(200 * u.nm, 1200 * u.nm)
+    assert d['response'].shape == (4, 1001)
+    for f, response in zip(constant_filters, d['response']):
+        expected = f.response(200 * u.nm, 1200 * u.nm)
+        assert d['wavelength'] == pytest.approx(expected['wavelength'])
+        assert response == pytest.approx(expected['response'])
+
+
+def test_filter_bank_throughput():
+    bank = filters.FilterBank([400, 800], [100, 200], [1.0, 0.5])
+    waves = np.linspace(200, 1200, 10001)
+    throughput = bank.throughput(waves, np.full(waves.shape, 2.0))
+    assert throughput == pytest.approx([200, 200], rel=2e-3)
+
+
+@pytest.mark.parametrize('filt', [
+    filters.ConstantFilter(550, 40, 0.8),
+    filters.GaussianFilter(550, 40, 0.8),
+    filters.TrapezoidFilter(550, 40, 0.8, edge=10),
+    filters.TabulatedFilter([500, 530, 560, 600], [0.0, 0.9, 0.6, 0.0]),
+])
+def test_band_integral_is_exact_for_sampled_spectrum(filt):
+    coarse = np.linspace(300, 800, 26)
+    spectrum = 1 + np.sin(coarse / 40)
+    fine = np.linspace(300, 800, 500001)
+    expected = np.trapezoid(filt.transmission_at(fine) *
+                            np.interp(fine, coarse, spectrum), fine)
+    assert filt.band_integral(coarse, spectrum) == pytest.approx(
+        expected, rel=1e-4)
+
+
+def test_trapezoid_filter_area():
+    filt = filters.TrapezoidFilter(700, 50, 0.9, edge=20)
+    waves = np.linspace(600, 800, 11)
+    assert filt.band_integral(waves, np.ones(11)) == pytest.approx(45)
+    assert filt.center == pytest.approx(700)
+    assert filt.width == pytest.approx(50)
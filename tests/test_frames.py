@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for `pytelescope.frames` module."""
+
+import numpy as np
+import pytest
+from astropy import units as u
+
+from pytelescope import detectors, exposure, frames
+
+
+@pytest.fixture
+def detector():
+    return detectors.Detector(300, 200, 12, read_noise=5.0,
+                              dark_current=100.0, gain=2.0)
+
+
+def test_frame_statistics(detector):
+    sim = frames.FrameSimulator(detector, [1e4, 2e4], exp=0.1, seed=1,
+                                tile=(128, 64))
+    stack = sim.run(jobs=4)
+    assert stack.shape == (2, 300, 200)
+    assert stack.dtype == np.uint16
+    noise = exposure.NoiseModel.from_detector(detector)
+    for frame, rate in zip(stack, sim.rates):
+        assert frame.mean() == pytest.approx((rate + 100) * 0.1 / 2, rel=1e-3)
+        assert frame.std() == pytest.approx(noise.noise(rate, 0.1) / 2,
+                                            rel=0.05)
+
+
+def test_frames_are_reproducible(detector):
+    kwargs = dict(rates=1e4 * u.one, exp=0.1, seed=3, tile=(64, 64))
+    first = frames.FrameSimulator(detector, **kwargs).run(jobs=1)
+    again = frames.FrameSimulator(detector, **kwargs).run(jobs=8)
+    np.testing.assert_array_equal(first, again)
+
+
+def test_frames_saturate_and_use_scene(detector, tmp_path):
+    scene = np.zeros((300, 200))
+    scene[:, 100:] = 1
+    sim = frames.FrameSimulator(detector, 1e9, exp=1, scene=scene,
+                                noise=exposure.NoiseModel(), seed=0)
+    stack = sim.run(tmp_path / 'stack.npy')
+    assert isinstance(stack, np.memmap)
+    assert stack[0, :, :100].max() == 0
+    assert (stack[0, :, 100:] == 4095).all()
+    stored = np.load(tmp_path / 'stack.npy', mmap_mode='r')
+    assert stored.shape == (1, 300, 200)
+
+
+def test_eight_bit_frames():
+    sim = frames.FrameSimulator(detectors.Detector(10, 10, 8), 10.0, seed=0)
+    assert sim.dtype == np.uint8
@@ -3,9 +3,13 @@
 
 """Tests for `pytelescope` package."""
 
+import warnings
+
+import numpy as np
 import pytest
+from astropy import units as u
 
-from pytelescope import orbiter
+from pytelescope import orbiters
 
 
 @pytest.fixture
@@ -20,7 +24,7 @@ def response():
 
 @pytest.fixture()
 def mars_orbiter():
-    orb = orbiter.MarsOrbiter(350)
+    orb = orbiters.MarsOrbiter(350)
     return orb
 
 
@@ -42,3 +46,111 @@ def test_mars_orbiter_orbital_velocity(mars_orbiter):
 
 def test_mars_orbiter_ground_track_speed(mars_orbiter):
     assert mars_orbiter.v_surf.value == pytest.approx(3067.464831608527)
+
+
+def test_orbiter_grid_matches_scalar_orbiter(mars_orbiter):
+    grid = orbiters.OrbiterGrid(['MARS', 'VENUS'], [300, 350, 400] * u.km)
+    assert grid.shape == (2, 3)
+    assert grid.v_surf[0, 1].value == pytest.approx(mars_orbiter.v_surf.value)
+    assert grid.slew_rate[0, 1].value == pytest.approx(
+        mars_orbiter.slew_rate.value)
+
+
+def test_orbiter_grid_table():
+    alts = np.linspace(200, 1000, 5) * u.km
+    table = orbiters.OrbiterGrid(['MARS', 'VENUS'], alts).table()
+    assert list(table['body']) == ['MARS'] * 5 + ['VENUS'] * 5
+    assert table['T'].shape == (10,)
+    assert table['alt'][5:].to(u.km).value == pytest.approx(alts.value)
+
+
+def test_orbiter_memoizes_until_alt_changes(mars_orbiter):
+    assert mars_orbiter.T is mars_orbiter.T
+    T_350 = mars_orbiter.T
+    mars_orbiter.alt = 400 * u.km
+    assert mars_orbiter.T > T_350
+
+
+def test_body_constants_are_cached(monkeypatch):
+    orbiters.body_constants('MARS')
+    calls = []
+    monkeypatch.setattr(orbiters, '_spice_constants', calls.append)
+    orbiters.MarsOrbiter(350).slew_rate
+    assert calls == []
+
+
+def test_bundled_constants_skip_kernel_loading(monkeypatch):
+    monkeypatch.setattr(orbiters, 'use_spice', False)
+    monkeypatch.setattr(orbiters, 'load_kernels', None)
+    orbiters.clear_body_constants()
+    orb = orbiters.MarsOrbiter(350)
+    assert orb.v.value == pytest.approx(3384.208966304714)
+    orbiters.clear_body_constants()
+
+
+def test_failed_kernel_load_is_not_retried(monkeypatch):
+    calls = []
+
+    def fail():
+        calls.append(None)
+        raise OSError("offline")
+
+    monkeypatch.setattr(orbiters, '_load_generic_kernels', fail)
+    monkeypatch.setattr(orbiters, 'use_spice', True)
+    monkeypatch.setattr(orbiters, '_kernels_loaded', False)
+    orbiters.clear_body_constants()
+    with pytest.warns(UserWarning, match='offline'):
+        assert orbiters.body_GM('MARS') == orbiters.BODY_CONSTANTS['MARS'][0]
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        assert orbiters.body_GM('VENUS') == \
+            orbiters.BODY_CONSTANTS['VENUS'][0]
+    with pytest.raises(RuntimeError):
+        orbiters.body_GM('PLUTO')
+    assert len(calls) == 1
+    orbiters.clear_body_constants()
+
+
+def test_solve_kepler():
+    M = np.linspace(0, 4 * np.pi, 1001)
+    for e in [0.0, 0.3, 0.95]:
+        E = orbiters.solve_kepler(M, e)
+        assert E - e * np.sin(E) == pytest.approx(np.mod(M, 2 * np.pi),
+                                                  abs=1e-10)
+    assert orbiters.solve_kepler(1.0, 0.5).shape == ()
+
+
+def test_elliptical_orbiter_reduces_to_circular(mars_orbiter):
+    orb = orbiters.EllipticalOrbiter('MARS', 350 * u.km, 350 * u.km)
+    state = orb.state(np.linspace(0, 1, 5) * u.hour)
+    assert orb.T.value == pytest.approx(mars_orbiter.T.value)
+    assert state['v'].value == pytest.approx(mars_orbiter.v.value)
+    assert state['v_surf'].value == pytest.approx(mars_orbiter.v_surf.value)
+    assert state['slew_rate'].value == pytest.approx(
+        mars_orbiter.slew_rate.value)
+
+
+def test_elliptical_orbiter_state():
+    orb = orbiters.EllipticalOrbiter('VENUS', 250 * u.km, 66000 * u.km)
+    state = orb.state(np.array([0, 0.5]) * orb.T)
+    assert state['alt'].to(u.km).value == pytest.approx([250, 66000])
+    assert state['true_anomaly'].value == pytest.approx([0, 180])
+    assert state['v'][0] > state['v'][1]
+    assert orb.state(np.zeros(10**6) * u.s)['alt'].shape == (10**6,)
+    scalar = orb.state(0.5 * orb.T)
+    assert scalar['alt'].shape == ()
+    assert scalar['alt'].to_value(u.km) == pytest.approx(66000)
+    assert orb.state(np.zeros((2, 3)) * u.s)['v'].shape == (2, 3)
+
+
+def test_elliptical_orbiter_memoizes_until_orbit_changes():
+    orb = orbiters.EllipticalOrbiter('MARS', 300 * u.km, 10000 * u.km)
+    T = orb.T
+    orb.apo_alt = 20000 * u.km
+    assert orb.T > T
+    e = orb.e
+    orb.peri_alt = 1000 * u.km
+    assert orb.e < e
+    R_body = orb.R_body
+    orb.body = 'VENUS'
+    assert orb.R_body > R_body
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for `pytelescope.radiometry` module."""
+
+import numpy as np
+import pytest
+from astropy import units as u
+
+from pytelescope import radiometry
+
+
+def test_solar_irradiance_is_cached():
+    radiometry.clear_irradiance_cache()
+    waves, irradiance = radiometry.solar_irradiance()
+    assert waves.size == irradiance.size == 1001
+    assert radiometry.solar_irradiance()[1] is not None
+    assert radiometry._cached_irradiance.cache_info().hits == 1
+    with pytest.raises(ValueError):
+        irradiance[0] = 0
+
+
+def test_solar_irradiance_disk_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(radiometry, 'irradiance_cache_dir', tmp_path)
+    radiometry.clear_irradiance_cache()
+    waves, irradiance = radiometry.solar_irradiance(dlambda=5 * u.nm)
+    assert len(list(tmp_path.glob('*.npy'))) == 1
+    radiometry.clear_irradiance_cache()
+    monkeypatch.setattr(radiometry, '_interpolate_irradiance', None)
+    _, cached = radiometry.solar_irradiance(dlambda=5 * u.nm)
+    assert isinstance(cached, np.memmap)
+    assert cached == pytest.approx(irradiance)
+    radiometry.clear_irradiance_cache()
+
+
+def test_radiometry_signal_rate(spectra_path):
+    rad = radiometry.Radiometry()
+    assert rad.waves[0] == 200 * u.nm
+    assert rad.signal_rate.value > 0
+    assert rad.SNR() > 0
+
+
+def test_outer_grid_shapes():
+    a, b, c = radiometry.outer_grid(np.arange(3), 2.0, np.arange(4))
+    assert a.shape == (3, 1)
+    assert b == 2.0
+    assert c.shape == (1, 4)
+
+
+def test_snr_grid_matches_scalar_snr(spectra_path):
+    rad = radiometry.Radiometry()
+    i = [30, 60, 75] * u.deg
+    d = np.array([0.7, 1.5])
+    exp = np.array([0.001, 0.01, 0.1, 1.0])
+    A_t = [5e-3, 1e-2] * u.m * u.m
+    cube = rad.SNR_grid(i, d, exp, A_t=A_t)
+    assert cube.shape == (3, 2, 4, 2)
+    rad.i, rad.d, rad.A_t = i[2], d[1], A_t[0]
+    assert cube[2, 1, 1, 0] == pytest.approx(rad.SNR(0.01))
+    assert rad.signal_rate_grid().value == pytest.approx(
+        rad.signal_rate.value)
+
+
+def test_interpolate_matches_linear_spline():
+    from scipy.interpolate import InterpolatedUnivariateSpline
+
+    xp = np.array([225., 300., 500., 900., 1100.])
+    fp = np.array([0.0, 0.3, 0.6, 0.4, 0.0])
+    x = np.linspace(200, 1200, 101)
+    expected = InterpolatedUnivariateSpline(xp, fp, k=1)(x)
+    assert radiometry.interpolate(x, xp, fp) == pytest.approx(expected)
+
+
+def test_interpolations_are_memoized(spectra_path):
+    rad = radiometry.Radiometry()
+    assert rad.QE_ipol is rad.QE_ipol
+    refl = rad.refl_ipol
+    assert rad.resp_ipol is refl
+    rad.reflectance = rad.reflectance.assign(Reflectance=0.5)
+    assert rad.refl_ipol == pytest.approx(0.5)
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for `pytelescope.scenes` module."""
+
+import numpy as np
+import pytest
+from astropy import units as u
+
+from pytelescope import filters, radiometry, scenes
+
+
+@pytest.fixture
+def rad(spectra_path):
+    return radiometry.Radiometry(dlambda=5 * u.nm)
+
+
+def test_resample_rows():
+    xp = np.array([0.0, 1.0, 2.0])
+    fp = np.array([[0.0, 1.0, 2.0], [1.0, 1.0, 3.0]])
+    out = scenes.resample_rows(np.array([-1, 0.5, 1.5, 3]), xp, fp)
+    assert out[0] == pytest.approx([0, 0.5, 1.5, 2])
+    assert out[1] == pytest.approx([1, 1, 2, 3])
+
+
+def test_scene_rates_match_radiometry(rad):
+    bank = filters.FilterBank([450, 650, 850], 100)
+    engine = scenes.SceneRates(rad, bank)
+    library = np.outer([1.0, 0.5, 2.0], rad.resp_ipol)
+    rates = engine.count_rates(library)
+    assert rates.shape == (3, 3)
+    expected = rad.band_signal_rates(bank)
+    assert rates[0].value == pytest.approx(expected.value)
+    assert rates[1].value == pytest.approx(expected.value / 2)
+    assert rates.unit == expected.unit
+
+
+def test_scene_rates_without_filters(rad):
+    engine = scenes.SceneRates(rad)
+    rate = engine.count_rates(rad.resp_ipol)
+    assert rate.shape == (1,)
+    assert rate[0].value == pytest.approx(rad.signal_rate.value)
+
+
+def test_scene_rates_resample_other_grid(rad):
+    engine = scenes.SceneRates(rad, filters.FilterBank([500, 700], 50))
+    waves = np.linspace(150, 1300, 300)
+    library = np.full((25, waves.size), 0.3)
+    rates = engine.count_rates(library, waves=waves, chunksize=7)
+    flat = engine.count_rates(np.full(engine.waves.size, 0.3))
+    assert rates.value == pytest.approx(np.tile(flat.value, (25, 1)))
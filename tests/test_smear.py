@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for `pytelescope.smear` module."""
+
+import numpy as np
+import pytest
+from astropy import units as u
+
+from pytelescope import cameras, orbiters, smear
+
+
+@pytest.fixture()
+def camera():
+    return cameras.Camera(fov=10, x=2048, y=2048, bits=12)
+
+
+def test_smear_matches_ground_travel(camera):
+    orb = orbiters.MarsOrbiter(350 * u.km)
+    sm = smear.Smear(camera, orb, 5 * u.ms)
+    expected = orb.ground_travel(5 * u.ms) / (orb.alt * camera.ifov[0])
+    assert sm.pixels == pytest.approx(expected.decompose().value)
+    assert smear.Smear(camera, orb, sm.max_exposure).pixels == \
+        pytest.approx(1)
+
+
+def test_smear_grid(camera):
+    orb = orbiters.MarsOrbiter([250, 350, 500] * u.km)
+    exp = np.logspace(-4, -1, 7) * u.s
+    table = smear.Smear(camera, orb, exp, max_smear=0.5).table()
+    assert table['pixels'].shape == (3, 7)
+    assert np.all(np.diff(table['pixels'], axis=0) < 0)
+    assert np.all(table['tdi_stages'] >= table['pixels'])
+    assert table['max_exposure'][:, 0].value == pytest.approx(
+        table['line_time'][:, 0].value / 2)
+
+
+def test_full_compensation(camera):
+    orb = orbiters.MarsOrbiter(350 * u.km)
+    sm = smear.Smear(camera, orb, 1 * u.s, compensation=1)
+    assert sm.pixels == 0
+    assert sm.tdi_stages == 1
+
+
+def test_tdi_stages_at_least_one(camera):
+    orb = orbiters.MarsOrbiter(350 * u.km)
+    sm = smear.Smear(camera, orb, [0, 1e-6, 1] * u.s)
+    assert sm.tdi_stages[0] == 1
+    assert sm.tdi_stages[1] == 1
+    assert sm.tdi_stages[2] > 1
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for `pytelescope.timeline` module."""
+
+import numpy as np
+import pytest
+from astropy import units as u
+
+from pytelescope import filters, orbiters, radiometry, timeline
+
+
+@pytest.fixture()
+def signal_timeline(spectra_path):
+    bank = filters.FilterBank([450, 650, 850], 50)
+    return timeline.SignalTimeline(orbiters.MarsOrbiter(350 * u.km),
+                                   radiometry.Radiometry(), bank,
+                                   cadence=5 * u.s, beta=30 * u.deg)
+
+
+def test_band_signal_rates(spectra_path):
+    rad = radiometry.Radiometry()
+    bank = filters.FilterBank([450, 650, 850], 50)
+    rates = rad.band_signal_rates(bank)
+    single = [rad.band_signal_rates([filters.ConstantFilter(c, 50, 1.0)])
+              for c in [450, 650, 850]]
+    assert rates.value == pytest.approx(np.ravel(single))
+    # a band over the whole grid integrates the spectrum by the trapezoid
+    # rule, `signal_rate` sums the samples
+    everything = filters.FilterBank([700], [1100])
+    waves = rad.waves.to_value(u.nm)
+    weights = filters.trapezoid_weights(waves) / np.gradient(waves)
+    assert rad.band_signal_rates(everything)[0].value == pytest.approx(
+        rad.CR.value @ weights)
+
+
+def test_band_signal_rates_integrate_filters(spectra_path):
+    rates = []
+    for dlambda in [1, 20] * u.nm:
+        rad = radiometry.Radiometry(dlambda=dlambda)
+        bank = [filters.ConstantFilter(455, 10, 0.9),
+                filters.GaussianFilter(640, 30, 0.9)]
+        rates.append(rad.band_signal_rates(bank).value * dlambda.value)
+    assert rates[1] == pytest.approx(rates[0], rel=0.05)
+
+
+def test_timeline_chunks(signal_timeline):
+    chunks = list(signal_timeline.chunks(1 * u.day, chunksize=5000))
+    assert [len(c['t']) for c in chunks] == [5000] * 3 + [2280]
+    full = signal_timeline.run(1 * u.day)
+    assert full['SNR'].shape == (17280, 3)
+    assert np.concatenate([c['SNR'] for c in chunks]) == pytest.approx(
+        full['SNR'])
+
+
+def test_timeline_incidence(signal_timeline):
+    t = signal_timeline.orbiter.T.to_value(u.s) * np.array([0, 0.25, 0.5])
+    cos_i = signal_timeline.incidence(t)
+    assert np.degrees(np.arccos(cos_i[0])) == pytest.approx(30)
+    assert cos_i[1] == pytest.approx(0, abs=1e-12)
+    assert cos_i[2] < 0
+    rad = signal_timeline.radiometry
+    rates = rad.band_signal_rates(signal_timeline.filters, i=30 * u.deg)
+    first = signal_timeline.run(1 * u.s)
+    assert first['signal_rate'][0] == pytest.approx(rates.value)
+
+
+def test_zenith_rates_are_memoized(signal_timeline):
+    rates = signal_timeline.zenith_rates
+    assert signal_timeline.zenith_rates is rates
+    signal_timeline.filters = filters.FilterBank([450, 650], 50)
+    assert signal_timeline.zenith_rates.shape == (2,)
+
+
+def test_timeline_zero_duration(signal_timeline):
+    empty = signal_timeline.run(0 * u.s)
+    assert empty['t'].shape == (0,)
+    assert empty['SNR'].shape == (0, 3)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for `pytelescope.trades` module."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from astropy import units as u
+
+from pytelescope import filters, orbiters, radiometry, trades
+
+
+@pytest.fixture()
+def study(spectra_path):
+    bank = filters.FilterBank([450, 650, 850], 50)
+    return trades.TradeStudy('MARS', radiometry.Radiometry(), bank,
+                             alt=[250, 350, 500], f=[1.0, 1.3],
+                             bits=[8, 12], band=[0, 1, 2])
+
+
+def test_trade_study_results(study):
+    assert study.shape[:3] == (3, 1, 2)
+    assert len(study) == 36
+    df = study.run(chunksize=10)
+    assert len(df) == 36
+    row = df[(df.alt == 350) & (df.f == 1.3) & (df.band == 1)].iloc[0]
+    orb = orbiters.MarsOrbiter(350 * u.km)
+    assert row.slew_rate == pytest.approx(orb.slew_rate.value)
+    rad = study.radiometry
+    rate = rad.band_signal_rates(study.filters)[1]
+    assert row.signal_rate == pytest.approx(rate.value)
+    assert row.SNR == pytest.approx(np.sqrt(rate.value * 0.01))
+
+
+def test_trade_study_unknown_parameter(spectra_path):
+    with pytest.raises(ValueError):
+        trades.TradeStudy('MARS', radiometry.Radiometry(), alt=[300],
+                          aperture=[1])
+
+
+def test_trade_study_empty_grid(spectra_path):
+    study = trades.TradeStudy('MARS', radiometry.Radiometry(), alt=[])
+    assert len(study) == 0
+    df = study.run(jobs=2)
+    assert len(df) == 0
+    assert 'SNR' in df.columns
+
+
+def test_trade_study_interleaved_chunks(spectra_path):
+    rad = radiometry.Radiometry()
+    a = trades.TradeStudy('MARS', rad, alt=[300, 400], bits=12)
+    b = trades.TradeStudy('VENUS', rad, alt=[1000, 2000], bits=8)
+    chunks_a = a.chunks(chunksize=1)
+    chunks_b = b.chunks(chunksize=1)
+    first = [next(chunks_a), next(chunks_b)]
+    second = [next(chunks_a), next(chunks_b)]
+    assert [df.alt[0] for df in first + second] == [300, 1000, 400, 2000]
+    assert [df.bits[0] for df in first + second] == [12, 8, 12, 8]
+    expected = a.run().iloc[1]
+    assert second[0]['T'][0] == pytest.approx(expected['T'])
+
+
+@pytest.mark.parametrize('suffix, module', [('.parquet', 'pyarrow'),
+                                            ('.h5', 'h5py')])
+def test_trade_study_parallel_files(study, tmp_path, suffix, module):
+    pytest.importorskip(module)
+    path = tmp_path / f'results{suffix}'
+    study.run(path, chunksize=7, jobs=2)
+    if suffix == '.parquet':
+        df = pd.read_parquet(path)
+    else:
+        import h5py
+        with h5py.File(path, 'r') as f:
+            df = pd.DataFrame({k: v[:] for k, v in f['results'].items()})
+        df = df[study.run().columns]
+    pd.testing.assert_frame_equal(df, study.run())
@@ -0,0 +1,29 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for `pytelescope.utils` module."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from pytelescope import utils
+
+
+def test_ordered_map_bounds_pending_calls():
+    submitted = []
+
+    def square(x):
+        return x * x
+
+    with ThreadPoolExecutor(2) as executor:
+        submit = executor.submit
+
+        def counting_submit(*args):
+            submitted.append(args)
+            return submit(*args)
+
+        executor.submit = counting_submit
+        results = utils.ordered_map(executor, square,
+                                    [(i,) for i in range(10)], window=3)
+        assert next(results) == 0
+        assert len(submitted) == 3
+        assert list(results) == [i * i for i in range(1, 10)]